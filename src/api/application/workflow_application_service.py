@@ -528,13 +528,10 @@ class WorkflowApplicationService:
 
             # Wait for completion - check status instead of separate running state
             while True:
-                transaction_data = self._transaction_service.get_transaction(
-                    exchange_id
-                )
-                if not transaction_data:
+                current_status = self._transaction_service.get_status(exchange_id)
+                if current_status is None:
                     break
 
-                current_status = transaction_data.get("status", "")
                 if WorkflowStatus.is_terminal(current_status):
                     break
 
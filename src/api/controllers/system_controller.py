@@ -44,8 +44,13 @@ def list_workflows():
     summary="Retry failed transactions",
     description="Retry transactions that failed due to retryable errors",
 )
-async def retry_failed_transactions(max_retries: int = 3):
-    """Retry failed transactions with retryable errors."""
+async def retry_failed_transactions(max_retries: int = 3, use_index: bool = True):
+    """
+    Retry failed transactions with retryable errors.
+
+    Pass ``use_index=false`` to scan all transactions, which also picks up
+    failures recorded before the retryable index existed.
+    """
     try:
         # Import here to avoid circular imports
         from api.controllers.workflow_controller import (
@@ -58,7 +63,9 @@ async def retry_failed_transactions(max_retries: int = 3):
         retry_service = RetryService(transaction_service, workflow_orchestrator)
 
         # Process retryable transactions
-        stats = await retry_service.process_retryable_transactions(max_retries)
+        stats = await retry_service.process_retryable_transactions(
+            max_retries, use_index=use_index
+        )
 
         return RetryResponse(
             message=f"Processed {stats['total_found']} retryable transactions, "
@@ -30,6 +30,7 @@ class GoogleDriveConfig(BaseModel):
         "GOOGLE_CREDENTIALS_PATH", "secrets/google_credentials.json"
     )
     token_path: str = os.getenv("GOOGLE_TOKEN_PATH", "secrets/google_token.json")
+    max_concurrent_uploads: int = int(os.getenv("DRIVE_MAX_CONCURRENT_UPLOADS") or "2")
 
 
 class AppConfig(BaseModel):
@@ -3,26 +3,46 @@ Redis client service - handles only Redis connection management.
 """
 
 import json
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import redis.asyncio as redis
 from loguru import logger
 
+# First characters a JSON document can start with (Python's json also accepts
+# NaN/Infinity); anything else is kept as a plain string without parsing
+_JSON_START = frozenset('{["-0123456789tfnNI')
+
+# Shared async pool size; callers wait for a free connection beyond this
+DEFAULT_MAX_CONNECTIONS = 64
+
 
 class RedisClient:
     """Simple Redis client wrapper - only handles connection and basic operations."""
 
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    ):
         self._redis_url = redis_url
+        self._max_connections = max_connections
         self._client: Optional[redis.Redis] = None
         self._sync_client: Optional[redis.Redis] = None
+        # Registered Lua scripts keyed by source; invoked with EVALSHA
+        self._scripts: Dict[str, Any] = {}
 
     async def get_async_client(self) -> redis.Redis:
         """Get async Redis client."""
         if self._client is None:
-            self._client = redis.from_url(
-                self._redis_url, decode_responses=True, health_check_interval=30
+            # Bounded pool: bursts queue for a connection instead of opening new ones
+            pool = redis.BlockingConnectionPool.from_url(
+                self._redis_url,
+                max_connections=self._max_connections,
+                decode_responses=True,
+                health_check_interval=30,
             )
+            # from_pool hands ownership over, so close() also closes the pool
+            self._client = redis.Redis.from_pool(pool)
         return self._client
 
     def get_sync_client(self):
@@ -35,6 +55,23 @@ class RedisClient:
             )
         return self._sync_client
 
+    @staticmethod
+    def _decode_hash(data: Dict[str, str]) -> Dict[str, Any]:
+        """Convert hash values back from strings, handling JSON fields."""
+        result = {}
+        for k, v in data.items():
+            # Most fields are plain strings: skip the failing json.loads for them
+            if not isinstance(v, str) or v.lstrip()[:1] not in _JSON_START:
+                result[k] = v
+                continue
+            try:
+                # Try to parse as JSON first (for dicts/lists)
+                result[k] = json.loads(v)
+            except (json.JSONDecodeError, TypeError):
+                # Keep as string if not JSON
+                result[k] = v
+        return result
+
     async def set_hash(self, key: str, data: Dict[str, Any], ex: int = 86400) -> bool:
         """Set hash data with expiry - much more efficient than JSON strings."""
         try:
@@ -59,17 +96,7 @@ class RedisClient:
             data = await client.hgetall(key)
             if not data:
                 return None
-
-            # Convert back from strings, handling JSON fields
-            result = {}
-            for k, v in data.items():
-                try:
-                    # Try to parse as JSON first (for dicts/lists)
-                    result[k] = json.loads(v)
-                except (json.JSONDecodeError, TypeError):
-                    # Keep as string if not JSON
-                    result[k] = v
-            return result
+            return self._decode_hash(data)
         except Exception as e:
             logger.error(f"Error getting hash {key}: {e}")
             return None
@@ -81,23 +108,63 @@ class RedisClient:
             data = client.hgetall(key)
             if not data:
                 return None
-
-            # Convert back from strings, handling JSON fields
-            result = {}
-            for k, v in data.items():
-                try:
-                    # Try to parse as JSON first (for dicts/lists)
-                    result[k] = json.loads(v)
-                except (json.JSONDecodeError, TypeError):
-                    # Keep as string if not JSON
-                    result[k] = v
-            return result
+            return self._decode_hash(data)
         except Exception as e:
             logger.error(f"Error getting hash {key}: {e}")
             return None
 
+    async def scan_hashes(
+        self, match: str, count: int = 500, batch_size: int = 200
+    ) -> AsyncIterator[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Iterate hashes whose keys match a pattern without blocking the server.
+
+        Keys are walked with SCAN (instead of KEYS) and each batch of keys is
+        fetched with pipelined HGETALLs, so a batch costs a single round-trip.
+
+        Args:
+            match: Key pattern (e.g. ``transaction:*``)
+            count: SCAN COUNT hint per iteration
+            batch_size: Number of keys fetched per pipeline
+
+        Yields:
+            Lists of ``(key, hash_data)`` tuples; missing/empty hashes are skipped
+        """
+        client = await self.get_async_client()
+        batch: List[str] = []
+        async for key in client.scan_iter(match=match, count=count):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                yield await self._get_hashes(client, batch)
+                batch = []
+        if batch:
+            yield await self._get_hashes(client, batch)
+
+    async def get_hashes(self, keys: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get several hashes in one pipelined round-trip; missing keys are skipped."""
+        try:
+            client = await self.get_async_client()
+            return await self._get_hashes(client, keys)
+        except Exception as e:
+            logger.error(f"Error getting {len(keys)} hashes: {e}")
+            return []
+
+    async def _get_hashes(
+        self, client: redis.Redis, keys: List[str]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Fetch several hashes in one pipelined round-trip."""
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(key)
+            raw_hashes = await pipe.execute()
+        return [
+            (key, self._decode_hash(data))
+            for key, data in zip(keys, raw_hashes)
+            if data
+        ]
+
     async def get_hash_field(self, key: str, field: str) -> Optional[str]:
-        """Get single field from hash - very fast for lookups."""
+        """Get single field from hash - one HGET, never a full HGETALL."""
         try:
             client = await self.get_async_client()
             return await client.hget(key, field)
@@ -105,6 +172,26 @@ class RedisClient:
             logger.error(f"Error getting field {field} from hash {key}: {e}")
             return None
 
+    def get_hash_field_sync(self, key: str, field: str) -> Optional[str]:
+        """Get single field from hash synchronously."""
+        try:
+            client = self.get_sync_client()
+            return client.hget(key, field)
+        except Exception as e:
+            logger.error(f"Error getting field {field} from hash {key}: {e}")
+            return None
+
+    async def get_hash_fields(self, key: str, fields: List[str]) -> List[Optional[str]]:
+        """Get several fields from a hash in one HMGET; missing fields are None."""
+        if not fields:
+            return []
+        try:
+            client = await self.get_async_client()
+            return await client.hmget(key, fields)
+        except Exception as e:
+            logger.error(f"Error getting {len(fields)} fields from hash {key}: {e}")
+            return [None] * len(fields)
+
     async def set_hash_field(
         self, key: str, field: str, value: Any, ex: int = 86400
     ) -> bool:
@@ -142,6 +229,25 @@ class RedisClient:
             logger.error(f"Error getting key {key}: {e}")
             return None
 
+    async def get_set_members(self, key: str) -> List[str]:
+        """Get all members of a set."""
+        try:
+            client = await self.get_async_client()
+            return list(await client.smembers(key))
+        except Exception as e:
+            logger.error(f"Error getting members of set {key}: {e}")
+            return []
+
+    async def remove_from_set(self, key: str, *members: str) -> bool:
+        """Remove members from a set."""
+        try:
+            client = await self.get_async_client()
+            await client.srem(key, *members)
+            return True
+        except Exception as e:
+            logger.error(f"Error removing members from set {key}: {e}")
+            return False
+
     async def exists(self, key: str) -> bool:
         """Check if key exists."""
         try:
@@ -152,11 +258,18 @@ class RedisClient:
             logger.error(f"Error checking if key {key} exists: {e}")
             return False
 
-    async def pipeline_execute(self, operations):
-        """Execute operations in pipeline."""
+    async def pipeline_execute(self, operations, transaction: bool = True):
+        """
+        Execute operations in pipeline.
+
+        Args:
+            operations: Async callables that queue commands on the pipeline
+            transaction: Wrap the batch in MULTI/EXEC; disable for independent
+                writes that only need batching into one round-trip
+        """
         try:
             client = await self.get_async_client()
-            async with client.pipeline() as pipe:
+            async with client.pipeline(transaction=transaction) as pipe:
                 for op in operations:
                     await op(pipe)
                 await pipe.execute()
@@ -165,6 +278,28 @@ class RedisClient:
             logger.error(f"Error executing pipeline: {e}")
             return False
 
+    async def run_script(
+        self, script: str, keys: List[str], args: List[Any]
+    ) -> Optional[Any]:
+        """
+        Run a Lua script atomically in one round-trip.
+
+        The script is registered once per client and called with EVALSHA;
+        redis-py loads it again transparently if the server cache was flushed.
+
+        Returns:
+            The script's return value, or None on error
+        """
+        try:
+            client = await self.get_async_client()
+            registered = self._scripts.get(script)
+            if registered is None:
+                registered = self._scripts[script] = client.register_script(script)
+            return await registered(keys=keys, args=args)
+        except Exception as e:
+            logger.error(f"Error running Lua script on {keys}: {e}")
+            return None
+
     async def close(self):
         """Close connections."""
         if self._client:
@@ -100,7 +100,10 @@ class WorkflowOrchestrator:
             # Scale up Selenium nodes if auto-scaler is enabled
             if self._selenium_scaler:
                 logger.info("Ensuring Selenium capacity for workflow execution")
-                self._selenium_scaler.ensure_capacity(sessions_needed=1)
+                # docker-compose and hub polling block; keep them off the event loop
+                await asyncio.to_thread(
+                    self._selenium_scaler.ensure_capacity, sessions_needed=1
+                )
 
             # Update transaction status to running
             if self._transaction_service:
@@ -15,6 +15,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.wait import POLL_FREQUENCY
 
 from core.config import config
 from core.exceptions.infrastructure_exceptions import (
@@ -335,16 +336,22 @@ class BrowserManager:
             logger.error(f"Failed to navigate to {url}: {e}")
             raise
 
-    def find_element_safe(self, by: By, value: str, timeout: int = None):
+    def find_element_safe(
+        self,
+        by: By,
+        value: str,
+        timeout: int = None,
+        poll_frequency: float = POLL_FREQUENCY,
+    ):
         """Safely find an element with explicit wait."""
         if not self.wait:
             raise RuntimeError("Browser not properly initialized")
 
         try:
             wait_time = timeout or config.arca.implicit_wait
-            element = WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located((by, value))
-            )
+            element = WebDriverWait(
+                self.driver, wait_time, poll_frequency=poll_frequency
+            ).until(EC.presence_of_element_located((by, value)))
             return element
         except TimeoutException:
             logger.error(f"Element not found: {by}={value}")
@@ -368,14 +375,20 @@ class BrowserManager:
             logger.error(f"Element not clickable: {by}={value}")
             return False
 
-    def find_elements_safe(self, by: By, value: str, timeout: int = None):
+    def find_elements_safe(
+        self,
+        by: By,
+        value: str,
+        timeout: int = None,
+        poll_frequency: float = POLL_FREQUENCY,
+    ):
         """Safely find multiple elements with explicit wait."""
         if not self.driver:
             raise RuntimeError("Browser not started. Call start_browser() first.")
 
         try:
             wait_time = timeout or config.arca.implicit_wait
-            WebDriverWait(self.driver, wait_time).until(
+            WebDriverWait(self.driver, wait_time, poll_frequency=poll_frequency).until(
                 EC.presence_of_element_located((by, value))
             )
             elements = self.driver.find_elements(by, value)
@@ -4,6 +4,10 @@ Manages OAuth2 credentials and token refresh.
 """
 
 import os
+import threading
+import webbrowser
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from typing import Optional
 
@@ -12,6 +16,24 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from loguru import logger
 
+# Refresh the access token this many seconds before it expires
+REFRESH_MARGIN_SECONDS = 300
+
+
+class _OAuthCallbackHandler(BaseHTTPRequestHandler):
+    """Captures the OAuth2 redirect on the one-shot local callback server."""
+
+    def do_GET(self) -> None:
+        self.server.authorization_response = self.path
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(b"Authentication complete. You may close this window.")
+
+    def log_message(self, format: str, *args) -> None:
+        # Keep the default stderr access log out of the application output
+        pass
+
 
 class GoogleDriveAuth:
     """Handles Google Drive OAuth2 authentication."""
@@ -36,6 +58,11 @@ class GoogleDriveAuth:
             "https://www.googleapis.com/auth/drive.file",
             "https://www.googleapis.com/auth/drive.metadata.readonly",
         ]
+        self._creds: Optional[Credentials] = None
+        self._lock = threading.RLock()
+        self._refresh_timer: Optional[threading.Timer] = None
+        self._scheduled_expiry: Optional[datetime] = None
+        self._last_written_hash: Optional[int] = None
 
     def get_credentials(self) -> Optional[Credentials]:
         """
@@ -44,34 +71,92 @@ class GoogleDriveAuth:
         Returns:
             Valid Credentials object or None if authentication fails
         """
-        try:
-            creds = None
+        with self._lock:
+            try:
+                creds = self._creds
 
-            # Load existing credentials if available
-            if self.token_path.exists():
-                logger.info(f"Loading existing credentials from {self.token_path}")
-                creds = Credentials.from_authorized_user_file(
-                    str(self.token_path), self.scopes
-                )
+                # Load existing credentials if available
+                if creds is None and self.token_path.exists():
+                    logger.info(f"Loading existing credentials from {self.token_path}")
+                    creds = Credentials.from_authorized_user_file(
+                        str(self.token_path), self.scopes
+                    )
 
-            # Validate and refresh credentials if needed
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    logger.info("Refreshing expired credentials")
-                    creds.refresh(Request())
-                else:
-                    logger.info("Starting OAuth2 flow for new credentials")
-                    creds = self._run_oauth_flow()
+                # Validate and refresh credentials if needed
+                if not creds or not creds.valid:
+                    if creds and creds.expired and creds.refresh_token:
+                        logger.info("Refreshing expired credentials")
+                        creds.refresh(Request())
+                    else:
+                        logger.info("Starting OAuth2 flow for new credentials")
+                        creds = self._run_oauth_flow()
 
-                # Save credentials for future use
-                self._save_credentials(creds)
+                    # Save credentials for future use
+                    self._save_credentials(creds)
 
-            logger.info("Google Drive credentials obtained successfully")
-            return creds
+                self._creds = creds
+                self._schedule_refresh(creds)
+                logger.info("Google Drive credentials obtained successfully")
+                return creds
 
-        except Exception as e:
-            logger.error(f"Failed to obtain Google Drive credentials: {e}")
-            return None
+            except Exception as e:
+                logger.error(f"Failed to obtain Google Drive credentials: {e}")
+                return None
+
+    def _schedule_refresh(self, creds: Credentials) -> None:
+        """
+        Schedule a background token refresh shortly before expiry.
+
+        Keeps the HTTPS round-trip to the token endpoint off the upload path.
+        A timer is only (re)armed when the credentials expiry changes.
+
+        Args:
+            creds: Credentials to keep fresh
+        """
+        if not creds or not creds.refresh_token or not creds.expiry:
+            return
+        if self._refresh_timer is not None and self._scheduled_expiry == creds.expiry:
+            return
+
+        self._cancel_refresh()
+
+        # google-auth stores expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        delay = max((creds.expiry - now).total_seconds() - REFRESH_MARGIN_SECONDS, 0.0)
+
+        timer = threading.Timer(delay, self._background_refresh)
+        timer.daemon = True
+        timer.start()
+        self._refresh_timer = timer
+        self._scheduled_expiry = creds.expiry
+        logger.debug(f"Scheduled Google Drive token refresh in {delay:.0f}s")
+
+    def _cancel_refresh(self) -> None:
+        """Cancel the pending background refresh, if any."""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        self._refresh_timer = None
+        self._scheduled_expiry = None
+
+    def _background_refresh(self) -> None:
+        """Refresh cached credentials from the timer thread."""
+        with self._lock:
+            self._refresh_timer = None
+            self._scheduled_expiry = None
+            creds = self._creds
+            if creds is None or not creds.refresh_token:
+                return
+
+            try:
+                creds.refresh(Request())
+                self._save_credentials(creds)
+                logger.info("Google Drive credentials refreshed in background")
+            except Exception as e:
+                # Leave the token as-is; get_credentials refreshes on demand
+                logger.warning(f"Background credential refresh failed: {e}")
+                return
+
+            self._schedule_refresh(creds)
 
     def _run_oauth_flow(self) -> Optional[Credentials]:
         """
@@ -90,10 +175,30 @@ class GoogleDriveAuth:
             str(self.credentials_path), self.scopes
         )
 
-        # Run local server for OAuth2 callback
-        creds = flow.run_local_server(port=0)
+        # Serve exactly one OAuth2 callback request, then tear the server down
+        with HTTPServer(("localhost", 0), _OAuthCallbackHandler) as server:
+            server.authorization_response = None
+            port = server.server_address[1]
+            flow.redirect_uri = f"http://localhost:{port}/"
+
+            auth_url, _ = flow.authorization_url(prompt="consent")
+            logger.info(
+                f"Please visit this URL to authorize this application: {auth_url}"
+            )
+            webbrowser.open(auth_url, new=1, autoraise=True)
+
+            server.handle_request()
+            callback_path = server.authorization_response
+
+        if not callback_path:
+            raise RuntimeError("OAuth2 callback did not return an authorization code")
+
+        # oauthlib rejects plain http redirects; the callback is loopback-only
+        flow.fetch_token(
+            authorization_response=f"https://localhost:{port}{callback_path}"
+        )
         logger.info("OAuth2 flow completed successfully")
-        return creds
+        return flow.credentials
 
     def _save_credentials(self, creds: Credentials) -> None:
         """
@@ -103,11 +208,24 @@ class GoogleDriveAuth:
             creds: Credentials to save
         """
         try:
+            token_json = creds.to_json()
+            token_hash = hash(token_json)
+            if token_hash == self._last_written_hash:
+                logger.debug("Credentials unchanged, skipping token file write")
+                return
+
             # Ensure token directory exists
             self.token_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(self.token_path, "w") as token_file:
-                token_file.write(creds.to_json())
+            # Write to a sibling temp file and swap it in, so a crash mid-write
+            # never leaves a truncated token behind; the name is unique per
+            # process and thread so concurrent writers never share a temp file
+            tmp_path = self.token_path.with_name(
+                f"{self.token_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            tmp_path.write_text(token_json)
+            os.replace(tmp_path, self.token_path)
+            self._last_written_hash = token_hash
 
             logger.info(f"Credentials saved to {self.token_path}")
 
@@ -122,6 +240,10 @@ class GoogleDriveAuth:
             True if credentials were revoked successfully
         """
         try:
+            with self._lock:
+                self._cancel_refresh()
+                self._creds = None
+
             if self.token_path.exists():
                 creds = Credentials.from_authorized_user_file(
                     str(self.token_path), self.scopes
@@ -3,18 +3,173 @@ Google Drive file operations.
 Handles upload, download, and file management operations.
 """
 
+import hashlib
 import io
+import json
 import mimetypes
+import os
+import random
+import threading
+import time
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import Resource, build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
+from googleapiclient.http import (
+    HttpRequest,
+    MediaFileUpload,
+    MediaIoBaseDownload,
+    MediaIoBaseUpload,
+    build_http,
+)
 from loguru import logger
 
 from core.observability import record_file_operation
+from core.utils.file_utils import ensure_dir
+
+# Files at or above this size are sent as resumable uploads in chunks
+CHUNK_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Default metadata fields; keeps Drive responses small
+DEFAULT_METADATA_FIELDS = "id,name,size,mimeType,modifiedTime,parents"
+
+# Maximum sub-requests Drive accepts in one batch HTTP request
+BATCH_LIMIT = 100
+
+# Maximum page size accepted by files.list
+MAX_PAGE_SIZE = 1000
+
+# Transient Drive API failures worth retrying
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+
+# MIME types for the extensions workflows produce; mimetypes is the fallback
+_MIME = {
+    ".pdf": "application/pdf",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".html": "text/html",
+    ".csv": "text/csv",
+    ".zip": "application/zip",
+    ".xml": "application/xml",
+    ".json": "application/json",
+}
+
+T = TypeVar("T")
+
+# Drive services cached per thread (httplib2 is not thread-safe), keyed by
+# credentials fingerprint so connections are kept alive across instances
+_thread_local = threading.local()
+
+
+def _credentials_fingerprint(credentials: Credentials) -> str:
+    """Stable key identifying the account behind a credentials object."""
+    identity = (
+        f"{credentials.client_id}:{credentials.refresh_token or credentials.token}"
+    )
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def _get_drive_service(credentials: Credentials) -> Resource:
+    """
+    Return a Drive v3 service for the credentials, reusing the current thread's.
+
+    Reusing the service keeps its authorized HTTP connection alive, so only the
+    first call per thread pays the TCP/TLS handshake. The bundled discovery
+    document is used, avoiding network hits on build.
+
+    Args:
+        credentials: Valid Google OAuth2 credentials
+
+    Returns:
+        Drive v3 service resource
+    """
+    services = getattr(_thread_local, "services", None)
+    if services is None:
+        services = _thread_local.services = {}
+
+    key = _credentials_fingerprint(credentials)
+    service = services.get(key)
+    if service is None:
+        http = AuthorizedHttp(credentials, http=build_http())
+        service = build(
+            "drive", "v3", http=http, cache_discovery=False, static_discovery=True
+        )
+        services[key] = service
+    return service
+
+
+def _parse_reason(error: HttpError) -> str:
+    """Extract the Drive error reason (e.g. userRateLimitExceeded) from an HttpError."""
+    try:
+        details = json.loads(error.content.decode("utf-8"))
+        return details["error"]["errors"][0].get("reason", "")
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+        return ""
+
+
+def _is_retryable(status: int, reason: str) -> bool:
+    """Check whether a Drive API failure is transient."""
+    return status in RETRYABLE_STATUSES or (
+        status == 403 and reason in RATE_LIMIT_REASONS
+    )
+
+
+def _retry_drive(
+    fn: Callable[[], T],
+    operation_type: str,
+    max_attempts: int = 6,
+    base: float = 0.5,
+    cap: float = 30.0,
+) -> T:
+    """
+    Call a Drive API function, retrying quota and server errors.
+
+    Uses exponential backoff with jitter and honors the server Retry-After
+    header when present. Non-retryable errors, and the last failed attempt,
+    are re-raised to the caller.
+
+    Args:
+        fn: Zero-argument callable issuing the request (usually request.execute)
+        operation_type: File operation name used for retry metrics
+        max_attempts: Maximum number of attempts
+        base: Base backoff delay in seconds
+        cap: Maximum backoff delay in seconds
+
+    Returns:
+        Whatever fn returns
+    """
+    for attempt in range(max_attempts):
+        try:
+            return fn()
+        except HttpError as e:
+            status = e.resp.status
+            if attempt == max_attempts - 1 or not _is_retryable(
+                status, _parse_reason(e)
+            ):
+                raise
+
+            delay = min(cap, base * 2**attempt) + random.uniform(0, base)
+            retry_after = e.resp.get("retry-after")
+            if retry_after:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    pass
+
+            logger.warning(
+                f"Drive API returned {status} during {operation_type}, "
+                f"retrying in {delay:.1f}s (attempt {attempt + 1}/{max_attempts})"
+            )
+            record_file_operation(operation_type, "retry")
+            time.sleep(delay)
 
 
 class GoogleDriveOperations:
@@ -27,7 +182,8 @@ class GoogleDriveOperations:
         Args:
             credentials: Valid Google OAuth2 credentials
         """
-        self.service = build("drive", "v3", credentials=credentials)
+        self.service = _get_drive_service(credentials)
+        self._files = self.service.files()
 
     def upload_file(
         self,
@@ -69,25 +225,38 @@ class GoogleDriveOperations:
                 file_metadata.update(metadata)
 
             # Detect MIME type
-            mime_type, _ = mimetypes.guess_type(str(file_path_obj))
+            mime_type = _MIME.get(file_path_obj.suffix.lower())
             if mime_type is None:
-                mime_type = "application/octet-stream"
-
-            # Upload file
-            media = MediaFileUpload(str(file_path_obj), mimetype=mime_type)
+                mime_type = (
+                    mimetypes.guess_type(file_path_obj.name)[0]
+                    or "application/octet-stream"
+                )
 
-            file = (
-                self.service.files()
-                .create(
-                    body=file_metadata, media_body=media, fields="id,name,size,mimeType"
+            # Upload file, streaming large files from disk in chunks
+            if file_path_obj.stat().st_size >= CHUNK_THRESHOLD:
+                media = MediaFileUpload(
+                    file_path_obj,
+                    mimetype=mime_type,
+                    chunksize=UPLOAD_CHUNK_SIZE,
+                    resumable=True,
                 )
-                .execute()
+            else:
+                media = MediaFileUpload(file_path_obj, mimetype=mime_type)
+
+            request = self._files.create(
+                body=file_metadata, media_body=media, fields="id,name,size,mimeType"
             )
+            if media.resumable():
+                file = self._upload_in_chunks(request)
+            else:
+                file = _retry_drive(request.execute, "drive_upload")
 
             file_id = file.get("id")
             logger.info(
-                f"File uploaded successfully: {file.get('name')} "
-                f"(ID: {file_id}, Size: {file.get('size')} bytes)"
+                "File uploaded successfully: {name} (ID: {file_id}, Size: {size} bytes)",
+                name=file.get("name"),
+                file_id=file_id,
+                size=file.get("size"),
             )
 
             record_file_operation("drive_upload", "success")
@@ -135,22 +304,31 @@ class GoogleDriveOperations:
             if metadata:
                 file_metadata.update(metadata)
 
-            # Create media upload from bytes
+            # Create media upload from bytes, chunked only for large payloads
+            resumable = len(content) >= CHUNK_THRESHOLD
             media = MediaIoBaseUpload(
-                io.BytesIO(content), mimetype=mime_type, resumable=True
+                io.BytesIO(content),
+                mimetype=mime_type,
+                chunksize=UPLOAD_CHUNK_SIZE,
+                resumable=resumable,
             )
 
             # Upload file
-            file = (
-                self.service.files()
-                .create(body=file_metadata, media_body=media, fields="id,name,size")
-                .execute()
+            request = self._files.create(
+                body=file_metadata, media_body=media, fields="id,name,size"
             )
+            if resumable:
+                file = self._upload_in_chunks(request)
+            else:
+                file = _retry_drive(request.execute, "drive_upload_content")
 
             file_id = file.get("id")
             logger.info(
-                f"File content uploaded successfully: {file.get('name')} "
-                f"(ID: {file_id}, Size: {file.get('size')} bytes)"
+                "File content uploaded successfully: {name} "
+                "(ID: {file_id}, Size: {size} bytes)",
+                name=file.get("name"),
+                file_id=file_id,
+                size=file.get("size"),
             )
 
             record_file_operation("drive_upload_content", "success")
@@ -165,6 +343,29 @@ class GoogleDriveOperations:
             record_file_operation("drive_upload_content", "failed")
             return None
 
+    def _upload_in_chunks(self, request: HttpRequest) -> Dict[str, Any]:
+        """
+        Drive a resumable upload request chunk by chunk.
+
+        Each chunk is retried independently on transient server errors.
+
+        Args:
+            request: Files create request with a resumable media body
+
+        Returns:
+            Created file resource
+        """
+        response = None
+        while response is None:
+            status, response = request.next_chunk(num_retries=5)
+            if status:
+                logger.debug(
+                    "Upload progress: {progress}/{total_size} bytes",
+                    progress=status.resumable_progress,
+                    total_size=status.total_size,
+                )
+        return response
+
     def download_file(self, file_id: str, download_path: str) -> bool:
         """
         Download a file from Google Drive.
@@ -178,21 +379,37 @@ class GoogleDriveOperations:
         """
         try:
             # Get file metadata first
-            file_metadata = self.service.files().get(fileId=file_id).execute()
-
-            # Download file content
-            file_content = self.service.files().get_media(fileId=file_id).execute()
+            file_metadata = _retry_drive(
+                self._files.get(fileId=file_id, fields="name,size,mimeType").execute,
+                "drive_download",
+            )
 
-            # Save to local path
+            # Stream to a sibling temp file and swap it in only once complete
             download_path_obj = Path(download_path)
-            download_path_obj.parent.mkdir(parents=True, exist_ok=True)
+            ensure_dir(download_path_obj.parent)
+            tmp_path = download_path_obj.with_name(
+                f"{download_path_obj.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
 
-            with open(download_path_obj, "wb") as f:
-                f.write(file_content)
+            try:
+                with tmp_path.open("wb") as f:
+                    request = self._files.get_media(fileId=file_id)
+                    downloader = MediaIoBaseDownload(
+                        f, request, chunksize=DOWNLOAD_CHUNK_SIZE
+                    )
+                    done = False
+                    while not done:
+                        _, done = downloader.next_chunk(num_retries=5)
+                os.replace(tmp_path, download_path_obj)
+            finally:
+                # No-op after a successful replace; drops a partial download
+                tmp_path.unlink(missing_ok=True)
 
             logger.info(
-                f"File downloaded successfully: {file_metadata.get('name')} "
-                f"to {download_path}"
+                "File downloaded successfully: {name} to {download_path}",
+                name=file_metadata.get("name"),
+                file_id=file_id,
+                download_path=download_path,
             )
 
             record_file_operation("drive_download", "success")
@@ -229,14 +446,17 @@ class GoogleDriveOperations:
             if parent_folder_id:
                 folder_metadata["parents"] = [parent_folder_id]
 
-            folder = (
-                self.service.files()
-                .create(body=folder_metadata, fields="id,name")
-                .execute()
+            folder = _retry_drive(
+                self._files.create(body=folder_metadata, fields="id,name").execute,
+                "drive_create_folder",
             )
 
             folder_id = folder.get("id")
-            logger.info(f"Folder created successfully: {folder_name} (ID: {folder_id})")
+            logger.info(
+                "Folder created successfully: {folder_name} (ID: {folder_id})",
+                folder_name=folder_name,
+                folder_id=folder_id,
+            )
 
             record_file_operation("drive_create_folder", "success")
             return folder_id
@@ -268,14 +488,18 @@ class GoogleDriveOperations:
             List of file metadata dictionaries
         """
         try:
-            results = (
-                self.service.files()
-                .list(q=query, pageSize=max_results, fields=f"files({fields})")
-                .execute()
+            page_size = max(1, min(max_results, MAX_PAGE_SIZE))
+            files = list(
+                islice(
+                    self.iter_search_files(query, fields, page_size=page_size),
+                    max_results,
+                )
+            )
+            logger.info(
+                "Found {count} files matching query: {query}",
+                count=len(files),
+                query=query,
             )
-
-            files = results.get("files", [])
-            logger.info(f"Found {len(files)} files matching query: {query}")
 
             record_file_operation("drive_search", "success")
             return files
@@ -289,6 +513,42 @@ class GoogleDriveOperations:
             record_file_operation("drive_search", "failed")
             return []
 
+    def iter_search_files(
+        self,
+        query: str,
+        fields: str = "id,name,mimeType,size,modifiedTime",
+        page_size: int = 100,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over files matching a query, page by page.
+
+        Pages are only requested as the consumer advances, so breaking out
+        early skips the remaining pages. HttpError is raised to the caller.
+
+        Args:
+            query: Search query (e.g., "name contains 'VEP'")
+            fields: File fields to include in response
+            page_size: Files requested per page (Drive caps this at 1000)
+
+        Yields:
+            File metadata dictionaries
+        """
+        page_token = None
+        while True:
+            response = _retry_drive(
+                self._files.list(
+                    q=query,
+                    pageSize=page_size,
+                    pageToken=page_token,
+                    fields=f"nextPageToken,files({fields})",
+                ).execute,
+                "drive_search",
+            )
+            yield from response.get("files", [])
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return
+
     def delete_file(self, file_id: str) -> bool:
         """
         Delete a file from Google Drive.
@@ -300,8 +560,8 @@ class GoogleDriveOperations:
             True if deletion successful, False otherwise
         """
         try:
-            self.service.files().delete(fileId=file_id).execute()
-            logger.info(f"File deleted successfully: {file_id}")
+            _retry_drive(self._files.delete(fileId=file_id).execute, "drive_delete")
+            logger.info("File deleted successfully: {file_id}", file_id=file_id)
 
             record_file_operation("drive_delete", "success")
             return True
@@ -315,20 +575,33 @@ class GoogleDriveOperations:
             record_file_operation("drive_delete", "failed")
             return False
 
-    def get_file_metadata(self, file_id: str) -> Optional[Dict[str, Any]]:
+    def get_file_metadata(
+        self, file_id: str, fields: str = DEFAULT_METADATA_FIELDS
+    ) -> Optional[Dict[str, Any]]:
         """
         Get file metadata from Google Drive.
 
+        Only the fields in the mask are returned; callers that need
+        permissions, owners, etc. must pass an explicit fields mask.
+
         Args:
             file_id: Google Drive file ID
+            fields: Fields to include in response
 
         Returns:
             File metadata dictionary or None if failed
         """
         try:
-            metadata = self.service.files().get(fileId=file_id, fields="*").execute()
+            metadata = _retry_drive(
+                self._files.get(fileId=file_id, fields=fields).execute,
+                "drive_metadata",
+            )
 
-            logger.info(f"Retrieved metadata for file: {metadata.get('name')}")
+            logger.info(
+                "Retrieved metadata for file: {name}",
+                name=metadata.get("name"),
+                file_id=file_id,
+            )
             return metadata
 
         except HttpError as e:
@@ -337,3 +610,103 @@ class GoogleDriveOperations:
         except Exception as e:
             logger.error(f"Failed to get file metadata: {e}")
             return None
+
+    def batch_metadata(
+        self, file_ids: List[str], fields: str = "id,name,size,mimeType"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for several files using batched HTTP requests.
+
+        Args:
+            file_ids: Google Drive file IDs
+            fields: Fields to include in each response
+
+        Returns:
+            Mapping of file ID to metadata for the files that were retrieved
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def _collect(request_id: str, response: Dict[str, Any], exception) -> None:
+            if exception is not None:
+                logger.error(
+                    f"Google Drive API error getting metadata for {request_id}: "
+                    f"{exception}"
+                )
+                return
+            results[request_id] = response
+
+        self._run_batches(
+            file_ids,
+            lambda file_id: self._files.get(fileId=file_id, fields=fields),
+            _collect,
+            "drive_batch_metadata",
+        )
+        logger.info(
+            "Retrieved metadata for {retrieved}/{requested} files",
+            retrieved=len(results),
+            requested=len(file_ids),
+        )
+        return results
+
+    def delete_files(self, file_ids: List[str]) -> int:
+        """
+        Delete several files using batched HTTP requests.
+
+        Args:
+            file_ids: Google Drive file IDs to delete
+
+        Returns:
+            Number of files deleted successfully
+        """
+        deleted: List[str] = []
+
+        def _collect(request_id: str, response: Any, exception) -> None:
+            if exception is not None:
+                logger.error(
+                    f"Google Drive API error during deletion of {request_id}: "
+                    f"{exception}"
+                )
+                record_file_operation("drive_delete", "failed")
+                return
+            deleted.append(request_id)
+            record_file_operation("drive_delete", "success")
+
+        self._run_batches(
+            file_ids,
+            lambda file_id: self._files.delete(fileId=file_id),
+            _collect,
+            "drive_batch_delete",
+        )
+        logger.info(
+            "Deleted {deleted}/{requested} files",
+            deleted=len(deleted),
+            requested=len(file_ids),
+        )
+        return len(deleted)
+
+    def _run_batches(
+        self,
+        file_ids: List[str],
+        make_request: Callable[[str], HttpRequest],
+        callback: Callable[[str, Any, Optional[Exception]], None],
+        operation_type: str,
+    ) -> None:
+        """
+        Execute one request per file ID, packed into batches of BATCH_LIMIT.
+
+        Args:
+            file_ids: Google Drive file IDs, used as batch request IDs
+            make_request: Builds the request for a file ID
+            callback: Receives (file_id, response, exception) for each request
+            operation_type: File operation name used for metrics
+        """
+        unique_ids = list(dict.fromkeys(file_ids))
+        for start in range(0, len(unique_ids), BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for file_id in unique_ids[start : start + BATCH_LIMIT]:
+                batch.add(make_request(file_id), request_id=file_id)
+            try:
+                _retry_drive(batch.execute, operation_type)
+            except HttpError as e:
+                logger.error(f"Google Drive API error during {operation_type}: {e}")
+                record_file_operation(operation_type, "failed")
@@ -25,6 +25,7 @@ class GoogleDriveService:
         credentials_path: str,
         token_path: str,
         scopes: Optional[List[str]] = None,
+        auth: Optional[GoogleDriveAuth] = None,
     ):
         """
         Initialize Google Drive service.
@@ -33,8 +34,11 @@ class GoogleDriveService:
             credentials_path: Path to Google OAuth2 credentials JSON
             token_path: Path to store/retrieve user tokens
             scopes: List of OAuth2 scopes (optional)
+            auth: Existing authentication handler to share (optional); services
+                built in several threads should share one, so the token is
+                refreshed and saved once
         """
-        self.auth = GoogleDriveAuth(credentials_path, token_path, scopes)
+        self.auth = auth or GoogleDriveAuth(credentials_path, token_path, scopes)
         self.operations: Optional[GoogleDriveOperations] = None
         self._initialize_operations()
 
@@ -347,7 +351,7 @@ class GoogleDriveService:
             permission = {"type": "anyone", "role": "reader"}
 
             self.operations.service.permissions().create(
-                fileId=file_id, body=permission
+                fileId=file_id, body=permission, fields="id"
             ).execute()
 
             # Return shareable link
@@ -386,10 +390,9 @@ class GoogleDriveService:
 
             old_files = self.operations.search_files(query, max_results=100)
 
-            deleted_count = 0
-            for file in old_files:
-                if self.operations.delete_file(file["id"]):
-                    deleted_count += 1
+            deleted_count = self.operations.delete_files(
+                [file["id"] for file in old_files]
+            )
 
             logger.info(f"Cleaned up {deleted_count} old workflow files")
             return deleted_count
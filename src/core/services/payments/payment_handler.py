@@ -3,16 +3,20 @@ Payment handler that consolidates all payment method handling.
 Single source of truth for payment constants.
 """
 
-import base64
-import time
+import binascii
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from loguru import logger
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 
 from core.observability import record_file_operation, record_payment_by_type
 from core.services.browser.browser import BrowserManager
+from core.utils.file_utils import ensure_dir, write_bytes
 
 # ARCA payment methods mapping - Single source of truth
 PAYMENT_METHODS = {
@@ -25,15 +29,57 @@ PAYMENT_METHODS = {
 
 DEFAULT_PAYMENT_METHOD = "qr"
 
+# Payment methods whose data is a payment URL rather than a QR image
+_URL_METHODS = frozenset({"link", "pago_mis_cuentas", "inter_banking", "xn_group"})
+_ALL_METHODS = frozenset(PAYMENT_METHODS)
+_METHODS_PREVIEW = tuple(PAYMENT_METHODS)
+
+# Output directory for extracted QR images
+_QR_DIR = Path("resources/qr")
+
+# Page selectors
+_QR_PNG_CSS = "img[src^='data:image/png;base64,']"
+# Base64 PNG images tagged as QR by their alt or title
+_QR_TAGGED_CSS = f"{_QR_PNG_CSS}[alt*='QR' i], {_QR_PNG_CSS}[title*='QR' i]"
+_LINK_SELECTOR = "a[href*='redlink.com.ar'], a[title='RED LINK']"
+_PMC_SELECTOR = "a[href*='pagomiscuentas.com'], a[title='BANELCO']"
+_CONFIRM_XPATH = (
+    "//button[contains(text(), 'Aceptar') or contains(text(), 'OK') "
+    "or contains(text(), 'Confirm')]"
+)
+_MODAL_CSS = "div.modal.show"
+
+# Returns [mime, base64_data] for the QR-tagged (else first) base64 PNG, or null
+_QR_DATA_SCRIPT = f"""
+const img = document.querySelector("{_QR_TAGGED_CSS}")
+    || document.querySelector("{_QR_PNG_CSS}");
+if (!img) return null;
+const src = img.src;
+return [src.substring(5, src.indexOf(';')), src.substring(src.indexOf(',') + 1)];
+"""
+
+# Shared pool for file writes that can overlap with browser work
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="qr-io")
+
+
+def _decode_and_write(path: Path, base64_data: str) -> None:
+    """Decode a base64 payload and write it to path."""
+    write_bytes(path, binascii.a2b_base64(base64_data))
+    logger.info("QR code image saved: {path}", path=path)
+
 
 class PaymentHandler:
     """Unified payment handler for all payment methods."""
 
+    __slots__ = ("_browser", "workflow_type", "_pending_writes")
+
     def __init__(
         self, browser_manager: BrowserManager, workflow_type: Optional[str] = None
     ):
         self._browser = browser_manager
         self.workflow_type = workflow_type
+        self._pending_writes: List[Future] = []
+        ensure_dir(_QR_DIR)
 
     def select_payment_method(self, method: str) -> bool:
         """
@@ -47,15 +93,19 @@ class PaymentHandler:
         """
         try:
             # Validate payment method
-            if method not in PAYMENT_METHODS:
+            payment_id = PAYMENT_METHODS.get(method)
+            if payment_id is None:
                 logger.error(f"Invalid payment method: {method}")
                 logger.debug(
-                    f"Available payment methods: {list(PAYMENT_METHODS.keys())}"
+                    "Available payment methods: {methods}", methods=_METHODS_PREVIEW
                 )
                 return False
 
-            payment_id = PAYMENT_METHODS[method]
-            logger.info(f"Selecting payment method: {method} (ID: {payment_id})")
+            logger.info(
+                "Selecting payment method: {method} (ID: {payment_id})",
+                method=method,
+                payment_id=payment_id,
+            )
 
             # Find and click payment method element
             payment_element = self._browser.find_element_safe(
@@ -71,7 +121,8 @@ class PaymentHandler:
             try:
                 payment_element.click()
                 logger.debug(
-                    f"Payment method '{method}' clicked successfully (regular click)"
+                    "Payment method '{method}' clicked successfully (regular click)",
+                    method=method,
                 )
                 click_successful = True
             except Exception as e:
@@ -79,10 +130,12 @@ class PaymentHandler:
                 click_successful = False
 
             # Accept confirmation modal
-            if self._accept_confirmation():
+            if self._accept_confirmation(method):
                 # Record payment method selection success metric
                 record_payment_by_type(method, "success")
-                logger.info(f"Payment confirmation accepted for '{method}'")
+                logger.info(
+                    "Payment confirmation accepted for '{method}'", method=method
+                )
                 return True
             else:
                 # Record payment method selection failure metric
@@ -112,12 +165,7 @@ class PaymentHandler:
         try:
             if payment_method == "qr":
                 return self._extract_qr_code(base_filename)
-            elif payment_method in [
-                "link",
-                "pago_mis_cuentas",
-                "inter_banking",
-                "xn_group",
-            ]:
+            elif payment_method in _URL_METHODS:
                 return self._extract_payment_url(payment_method, base_filename)
             else:
                 logger.debug(
@@ -133,47 +181,29 @@ class PaymentHandler:
         try:
             logger.debug("Starting QR code image extraction")
 
-            # Find the QR image element
-            qr_element = self._find_qr_image_element()
-            if not qr_element:
+            # Wait for the QR to render, then read its data URL in one script call
+            if not self._find_qr_image_element():
                 logger.error("QR code image element not found")
                 return None
-
-            # Extract the base64 data from the src attribute
-            src_attribute = qr_element.get_attribute("src")
-            if not src_attribute or not src_attribute.startswith("data:image/"):
+            qr_data = self._browser.driver.execute_script(_QR_DATA_SCRIPT)
+            if not qr_data:
                 logger.error("QR image src attribute is not a data URL")
                 return None
 
-            # Parse the base64 data
-            try:
-                # Format: data:image/png;base64,<base64_data>
-                header, base64_data = src_attribute.split(",", 1)
-                image_format = header.split(";")[0].split("/")[
-                    1
-                ]  # Extract 'png' from 'data:image/png'
-            except (ValueError, IndexError) as e:
-                logger.error(f"Failed to parse base64 data URL: {e}")
-                return None
+            # Script returns [mime, base64_data], e.g. ["image/png", "iVBOR..."]
+            mime_type, base64_data = qr_data
+            image_format = mime_type.split("/")[-1]
 
             # Generate filename
             qr_filename = f"{base_filename}_qr.{image_format}"
 
-            # Ensure QR directory exists
-            qr_dir = Path("resources/qr")
-            qr_dir.mkdir(parents=True, exist_ok=True)
-
-            # Decode and save the image
-            qr_file_path = qr_dir / qr_filename
-            try:
-                image_data = base64.b64decode(base64_data)
-                with open(qr_file_path, "wb") as f:
-                    f.write(image_data)
-                logger.info(f"QR code image saved: {qr_file_path}")
-                return qr_filename
-            except Exception as save_error:
-                logger.error(f"Failed to save QR image: {save_error}")
-                return None
+            # Decode and save the image off the driver thread; flush() waits for it
+            qr_file_path = _QR_DIR / qr_filename
+            self._pending_writes.append(
+                _IO_POOL.submit(_decode_and_write, qr_file_path, base64_data)
+            )
+            logger.debug("QR code image write scheduled: {path}", path=qr_file_path)
+            return qr_filename
 
         except Exception as e:
             logger.error(f"Failed to extract QR code image: {e}")
@@ -184,7 +214,10 @@ class PaymentHandler:
     ) -> Optional[str]:
         """Extract payment URL from the page."""
         try:
-            logger.debug(f"Starting {payment_method} payment URL extraction")
+            logger.debug(
+                "Starting {payment_method} payment URL extraction",
+                payment_method=payment_method,
+            )
 
             # Find the URL element
             url_element = self._find_payment_url_element(payment_method)
@@ -203,10 +236,10 @@ class PaymentHandler:
                     logger.error("No valid URL found in the payment link element")
                     return None
 
-            logger.debug(f"Found payment URL: {url_href}")
+            logger.debug("Found payment URL: {url}", url=url_href)
 
             # Return the URL directly (no file persistence needed for static URLs)
-            logger.info(f"Payment URL extracted successfully")
+            logger.info("Payment URL extracted successfully")
             return url_href
 
         except Exception as e:
@@ -218,35 +251,15 @@ class PaymentHandler:
         try:
             logger.debug("Looking for QR code image element")
 
-            # Multiple strategies to find the QR image
-            qr_selectors = [
-                # Look for img with base64 PNG data
-                (By.XPATH, "//img[starts-with(@src, 'data:image/png;base64,')]"),
-                # Look for img with QR-related attributes or classes
-                (
-                    By.XPATH,
-                    "//img[contains(@class, 'qr') or contains(@alt, 'QR') or contains(@title, 'QR')]",
-                ),
-                # Generic approach - any img with data: src
-                (By.XPATH, "//img[starts-with(@src, 'data:image/')]"),
-            ]
-
-            for by, selector in qr_selectors:
-                try:
-                    elements = self._browser.find_elements_safe(by, selector, timeout=5)
-                    if elements:
-                        for element in elements:
-                            src = element.get_attribute("src")
-                            if src and "data:image/png;base64," in src:
-                                logger.debug(
-                                    f"Found QR image element with selector: {selector}"
-                                )
-                                return element
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
-
-            logger.warning("QR code image element not found with any selector")
+            # Only base64 PNGs carry the QR; wait until one is present
+            elements = self._browser.find_elements_safe(
+                By.CSS_SELECTOR, _QR_PNG_CSS, timeout=5, poll_frequency=0.1
+            )
+            if elements:
+                logger.debug("Found QR image element")
+                return elements[0]
+
+            logger.warning("QR code image element not found")
             return None
 
         except Exception as e:
@@ -256,49 +269,40 @@ class PaymentHandler:
     def _find_payment_url_element(self, payment_method: str):
         """Find the payment URL element on the page."""
         try:
-            logger.debug(f"Looking for {payment_method} payment URL element")
+            logger.debug(
+                "Looking for {payment_method} payment URL element",
+                payment_method=payment_method,
+            )
 
-            # Define selectors based on payment method
+            # Define a combined CSS selector based on payment method
             if payment_method == "link":
-                url_selectors = [
-                    (By.XPATH, "//a[@href='https://redlink.com.ar/arca.html']"),
-                    (By.XPATH, "//a[@title='RED LINK']"),
-                    (By.XPATH, "//a[contains(@href, 'redlink.com.ar')]"),
-                ]
+                url_selector = _LINK_SELECTOR
             else:  # pago_mis_cuentas
-                url_selectors = [
-                    (By.XPATH, "//a[@href='https://web.pagomiscuentas.com/login']"),
-                    (By.XPATH, "//a[@title='BANELCO']"),
-                    (By.XPATH, "//a[contains(@href, 'pagomiscuentas.com')]"),
-                ]
+                url_selector = _PMC_SELECTOR
 
-            for by, selector in url_selectors:
-                try:
-                    element = self._browser.find_element_safe(by, selector, timeout=5)
-                    if element:
-                        href = element.get_attribute("href")
-                        text = element.get_attribute("textContent") or element.text
-                        logger.debug(f"Found URL element with selector: {selector}")
-                        logger.debug(f"Element href: {href}, text: {text}")
-                        return element
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
-
-            logger.warning("Payment URL element not found with any selector")
+            element = self._browser.find_element_safe(
+                By.CSS_SELECTOR, url_selector, timeout=5, poll_frequency=0.1
+            )
+            if element:
+                logger.debug(
+                    "Found URL element with selector: {selector}", selector=url_selector
+                )
+                return element
+
+            logger.warning("Payment URL element not found with combined selector")
             return None
 
         except Exception as e:
             logger.error(f"Error finding payment URL element: {e}")
             return None
 
-    def _accept_confirmation(self) -> bool:
+    def _accept_confirmation(self, method: Optional[str] = None) -> bool:
         """Accept confirmation modal after payment method selection."""
         try:
             # Wait for modal to appear
             confirm_button = self._browser.find_element_safe(
                 By.XPATH,
-                "//button[contains(text(), 'Aceptar') or contains(text(), 'OK') or contains(text(), 'Confirm')]",
+                _CONFIRM_XPATH,
                 timeout=5,
             )
 
@@ -316,47 +320,31 @@ class PaymentHandler:
                     )
                     logger.debug("Confirmation modal accepted with JavaScript click")
 
-                # Wait for modal to close and page to stabilize
-                logger.debug("Waiting for modal to close and page to stabilize...")
-                time.sleep(2)
-
                 # Wait for modal overlay to disappear
-                modal_overlay_gone = False
-                for i in range(5):
-                    try:
-                        modal_overlay = self._browser.driver.find_element(
-                            By.XPATH,
-                            "//div[contains(@class, 'modal') and contains(@class, 'show')]",
-                        )
-                        if modal_overlay:
-                            logger.debug(
-                                f"Modal overlay still present, waiting... ({i+1}/5)"
-                            )
-                            time.sleep(1)
-                        else:
-                            modal_overlay_gone = True
-                            break
-                    except:
-                        # Modal overlay not found = good
-                        modal_overlay_gone = True
-                        break
-
-                if modal_overlay_gone:
+                logger.debug("Waiting for modal to close...")
+                try:
+                    WebDriverWait(
+                        self._browser.driver, 8, poll_frequency=0.1
+                    ).until_not(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, _MODAL_CSS))
+                    )
                     logger.debug("Modal overlay disappeared")
-                else:
-                    logger.warning("⚠️ Modal overlay still present after 5 seconds")
+                except TimeoutException:
+                    logger.warning("⚠️ Modal overlay still present after 8 seconds")
 
-                # Add workflow-specific wait time for QR rendering
-                if self.workflow_type == "ddjj":
-                    logger.debug(
-                        "DDJJ workflow detected - waiting 3 seconds for QR rendering"
-                    )
-                    time.sleep(3)
-                else:
-                    logger.debug(
-                        "CCMA workflow or default - waiting 1 second for QR rendering"
-                    )
-                    time.sleep(1)
+                # DDJJ renders the QR after the modal closes, wait until it is there
+                if self.workflow_type == "ddjj" and method == "qr":
+                    logger.debug("DDJJ workflow detected - waiting for QR rendering")
+                    try:
+                        WebDriverWait(
+                            self._browser.driver, 10, poll_frequency=0.1
+                        ).until(
+                            EC.presence_of_element_located(
+                                (By.CSS_SELECTOR, _QR_PNG_CSS)
+                            )
+                        )
+                    except TimeoutException:
+                        logger.warning("QR image not rendered after 10 seconds")
 
                 return True
             else:
@@ -367,10 +355,30 @@ class PaymentHandler:
             logger.warning(f"Error accepting confirmation modal: {e}")
             return True  # Continue anyway
 
+    def flush(self) -> bool:
+        """
+        Wait for scheduled file writes to finish.
+
+        Returns:
+            True if every pending write succeeded
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        if not pending:
+            return True
+
+        wait(pending)
+        ok = True
+        for future in pending:
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Failed to save QR image: {error}")
+                ok = False
+        return ok
+
     def get_default_payment_method(self) -> str:
         """Get default payment method."""
         return DEFAULT_PAYMENT_METHOD
 
     def validate_payment_method(self, method: str) -> bool:
         """Validate if payment method is supported."""
-        return method in PAYMENT_METHODS
+        return method in _ALL_METHODS
@@ -3,19 +3,98 @@ Payment service for handling payment method selection and result processing.
 Encapsulates common payment logic used across different workflows.
 """
 
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from loguru import logger
 from selenium.webdriver.common.by import By
 
 from core.config import config
 from core.observability import record_payment_by_type
+from core.services.google_drive.drive_auth import GoogleDriveAuth
 from core.services.google_drive.drive_service import GoogleDriveService
 from core.services.payments.payment_handler import PaymentHandler
 from core.services.vep.vep_data_extractor import VEPDataExtractor
 from core.services.vep.vep_pdf_generator import VepPdfGenerator
+from core.utils import ensure_dir
+
+# Payment methods that yield a payment URL / any extractable data
+_URL_PAYMENT_METHODS = frozenset(
+    {"link", "pago_mis_cuentas", "inter_banking", "xn_group"}
+)
+_DATA_EXTRACTION_METHODS = _URL_PAYMENT_METHODS | {"qr"}
+
+# Output directories for generated artifacts
+_PDF_DIR = Path("resources/pdf")
+_QR_DIR = Path("resources/qr")
+
+# httplib2 is not thread-safe: Drive clients are cached per thread, while the
+# credentials (and their refresh timer and token file) are shared process-wide
+_drive_local = threading.local()
+_drive_auth: Optional[GoogleDriveAuth] = None
+_drive_auth_lock = threading.Lock()
+_upload_pool: Optional[ThreadPoolExecutor] = None
+_upload_pool_lock = threading.Lock()
+
+
+def _get_drive_auth() -> GoogleDriveAuth:
+    """Return the process-wide Google Drive authentication handler."""
+    global _drive_auth
+
+    with _drive_auth_lock:
+        if _drive_auth is None:
+            drive_config = config.google_drive
+            _drive_auth = GoogleDriveAuth(
+                credentials_path=drive_config.credentials_path,
+                token_path=drive_config.token_path,
+            )
+        return _drive_auth
+
+
+def _get_drive_service() -> GoogleDriveService:
+    """Return the calling thread's Google Drive service, creating it once."""
+    drive_service = getattr(_drive_local, "drive_service", None)
+    if drive_service is None:
+        drive_config = config.google_drive
+        drive_service = GoogleDriveService(
+            credentials_path=drive_config.credentials_path,
+            token_path=drive_config.token_path,
+            auth=_get_drive_auth(),
+        )
+        _drive_local.drive_service = drive_service
+    return drive_service
+
+
+def _get_upload_pool() -> Optional[ThreadPoolExecutor]:
+    """
+    Return the shared Drive upload pool, or None when uploads are unavailable.
+
+    Only a successful initialization is cached, so a transient Drive failure
+    is retried by the next PaymentService.
+    """
+    global _upload_pool
+
+    drive_config = config.google_drive
+    if not drive_config.enabled:
+        return None
+
+    with _upload_pool_lock:
+        if _upload_pool is None:
+            try:
+                if not _get_drive_service().is_available():
+                    logger.warning("Google Drive service unavailable; uploads disabled")
+                    return None
+            except Exception as exc:
+                logger.error(f"Failed to initialize Google Drive service: {exc}")
+                return None
+            _upload_pool = ThreadPoolExecutor(
+                max_workers=drive_config.max_concurrent_uploads or 2,
+                thread_name_prefix="drive-upload",
+            )
+        return _upload_pool
 
 
 class PaymentService:
@@ -35,26 +114,16 @@ class PaymentService:
             workflow_type: Type of workflow (ccma, ddjj) for timing-specific behavior
         """
         self.payment_handler = PaymentHandler(browser_manager, workflow_type)
+        # The handler's default is a constant, so it is safe to cache
+        self._default_payment_method = self.payment_handler.get_default_payment_method()
         self._browser = browser_manager
         self.workflow_type = workflow_type or "workflow"
-        drive_config = config.google_drive
-        self._drive_upload_active = drive_config.enabled
-        self._drive_service: Optional[GoogleDriveService] = None
-
-        if self._drive_upload_active:
-            try:
-                drive_service = GoogleDriveService(
-                    credentials_path=drive_config.credentials_path,
-                    token_path=drive_config.token_path,
-                )
-                if drive_service.is_available():
-                    self._drive_service = drive_service
-                else:
-                    logger.warning("Google Drive service unavailable; uploads disabled")
-                    self._drive_upload_active = False
-            except Exception as exc:
-                logger.error(f"Failed to initialize Google Drive service: {exc}")
-                self._drive_upload_active = False
+        # Created once per process; keeps mkdir syscalls off the payment path
+        ensure_dir(_PDF_DIR)
+        ensure_dir(_QR_DIR)
+        # Drive clients and the upload pool are shared process-wide
+        self._upload_pool = _get_upload_pool()
+        self._drive_upload_active = self._upload_pool is not None
 
     def select_payment_method_and_store_results(
         self, form_payment: Optional[str], shared_resources: Dict[str, Any]
@@ -76,7 +145,7 @@ class PaymentService:
 
             # Use default payment method if none specified
             if not form_payment:
-                form_payment = self.payment_handler.get_default_payment_method()
+                form_payment = self._default_payment_method
                 logger.debug(
                     f"No payment method specified, using default: {form_payment}"
                 )
@@ -153,11 +222,12 @@ class PaymentService:
             pdf_filename: Name of the PDF file
             shared_resources: Dictionary to store the result
         """
+        pdf_path = _PDF_DIR / pdf_filename
         shared_resources["vep_pdf_filename"] = pdf_filename
-        shared_resources["vep_pdf_path"] = f"resources/pdf/{pdf_filename}"
-        self._upload_generated_file(
-            shared_resources.get("vep_pdf_path"), "pdf", shared_resources
-        )
+        shared_resources["vep_pdf_path"] = str(pdf_path)
+        upload = self._upload_generated_file(pdf_path, "pdf", shared_resources)
+        if upload:
+            wait([upload])
 
     def _store_dict_result(
         self, result: dict, shared_resources: Dict[str, Any]
@@ -169,54 +239,81 @@ class PaymentService:
             result: Dictionary containing file information
             shared_resources: Dictionary to store the results
         """
+        uploads: List[Future] = []
+
         # Store PDF filename and path if available
         if "pdf_filename" in result:
+            pdf_path = _PDF_DIR / result["pdf_filename"]
             shared_resources["vep_pdf_filename"] = result["pdf_filename"]
-            shared_resources["vep_pdf_path"] = f"resources/pdf/{result['pdf_filename']}"
-            self._upload_generated_file(
-                shared_resources.get("vep_pdf_path"), "pdf", shared_resources
+            shared_resources["vep_pdf_path"] = str(pdf_path)
+            uploads.append(
+                self._upload_generated_file(pdf_path, "pdf", shared_resources)
             )
 
         # Store QR filename and path if available
         if "qr_filename" in result:
+            qr_path = _QR_DIR / result["qr_filename"]
             shared_resources["vep_qr_filename"] = result["qr_filename"]
-            shared_resources["vep_qr_path"] = f"resources/qr/{result['qr_filename']}"
-            self._upload_generated_file(
-                shared_resources.get("vep_qr_path"), "qr", shared_resources
-            )
+            shared_resources["vep_qr_path"] = str(qr_path)
+            uploads.append(self._upload_generated_file(qr_path, "qr", shared_resources))
 
         # Store payment URL if available (no file persistence for URLs)
         if "payment_url" in result:
             shared_resources["payment_url"] = result["payment_url"]
 
+        # PDF and QR uploads run concurrently on the shared upload pool; callers
+        # are synchronous workflow steps, so waiting on the futures gives the
+        # same overlap an asyncio.gather would. Finish both before returning
+        pending = [upload for upload in uploads if upload is not None]
+        if pending:
+            wait(pending)
+
     def _upload_generated_file(
-        self, file_path: Optional[str], file_type: str, shared_resources: Dict[str, Any]
-    ) -> None:
+        self,
+        file_path: Optional[Union[str, Path]],
+        file_type: str,
+        shared_resources: Dict[str, Any],
+    ) -> Optional[Future]:
         """
-        Upload generated artifacts to Google Drive when enabled.
+        Schedule an upload of a generated artifact to Google Drive when enabled.
 
         Args:
             file_path: Local file path.
             file_type: Logical type (pdf, qr, etc.).
             shared_resources: Workflow shared resources for exchange metadata.
-        """
-        if not self._drive_upload_active or not file_path or not self._drive_service:
-            return
 
-        path_obj = Path(file_path)
-        if not path_obj.exists():
-            logger.warning(f"Drive upload skipped: file not found ({file_path})")
-            return
+        Returns:
+            Future for the upload, or None when no upload was scheduled.
+        """
+        if not self._drive_upload_active or not file_path or not self._upload_pool:
+            return None
 
         exchange_id = shared_resources.get("exchange_id")
         if not exchange_id:
             raise RuntimeError(
                 "exchange_id missing from shared_resources; it must be set by the orchestrator"
             )
+
+        return self._upload_pool.submit(
+            self._do_upload, Path(file_path), file_type, exchange_id
+        )
+
+    def _do_upload(self, path_obj: Path, file_type: str, exchange_id: str) -> None:
+        """
+        Upload a generated artifact to Google Drive (runs on an upload worker).
+
+        Callers only pass files they have just produced and verified, so the
+        path is not stat'ed again here; a missing file fails the upload itself.
+
+        Args:
+            path_obj: Local file path.
+            file_type: Logical type (pdf, qr, etc.).
+            exchange_id: Workflow exchange ID.
+        """
         workflow_type = self.workflow_type or "workflow"
 
         try:
-            file_id = self._drive_service.upload_workflow_file(
+            file_id = _get_drive_service().upload_workflow_file(
                 file_path=str(path_obj),
                 workflow_type=workflow_type,
                 exchange_id=exchange_id,
@@ -250,7 +347,7 @@ class PaymentService:
         Returns:
             Default payment method string
         """
-        return self.payment_handler.get_default_payment_method()
+        return self._default_payment_method
 
     def _generate_pdf_and_extract_data(
         self, payment_method: str, shared_resources: Dict[str, Any]
@@ -277,15 +374,8 @@ class PaymentService:
             # Step 1: Extract data based on payment method (QR/URLs)
             qr_filename = None
             payment_url = None
-            # Define URL-based payment methods
-            url_payment_methods = [
-                "link",
-                "pago_mis_cuentas",
-                "inter_banking",
-                "xn_group",
-            ]
-
-            if payment_method in ["qr"] + url_payment_methods:
+
+            if payment_method in _DATA_EXTRACTION_METHODS:
                 logger.debug(f"Extracting {payment_method} data")
                 extracted_data = self.payment_handler.extract_payment_data(
                     payment_method, base_filename
@@ -296,7 +386,7 @@ class PaymentService:
                     if payment_method == "qr":
                         qr_filename = extracted_data
                     # Store payment URL if this is a URL-based payment method
-                    elif payment_method in url_payment_methods:
+                    elif payment_method in _URL_PAYMENT_METHODS:
                         payment_url = extracted_data
                 else:
                     logger.warning(f"{payment_method} data extraction failed")
@@ -304,6 +394,11 @@ class PaymentService:
             # Step 2: Generate PDF using VEP data
             pdf_filename = self._generate_vep_pdf(shared_resources, base_filename)
 
+            # QR image is written in the background while the PDF is generated
+            if qr_filename and not self.payment_handler.flush():
+                logger.warning("QR image could not be saved")
+                qr_filename = None
+
             # Step 3: Build result dictionary with available data
             result = {}
 
@@ -379,39 +474,34 @@ class PaymentService:
                 logger.error("Could not obtain VEP data for PDF generation")
                 return None
 
-            # Ensure PDF directory exists
-            pdf_dir = Path("resources/pdf")
-            pdf_dir.mkdir(parents=True, exist_ok=True)
-
             # Generate PDF filename
             pdf_filename = f"{base_filename}.pdf"
-            pdf_path = pdf_dir / pdf_filename
+            pdf_path = _PDF_DIR / pdf_filename
+
+            # Read each VEP field once
+            nro_vep = getattr(vep_data, "nro_formulario", "1571")
+            cuit = getattr(vep_data, "cuit", "00000000000")
+            periodo = getattr(vep_data, "periodo_fiscal", "202412")
+            concepto = getattr(vep_data, "concepto", "19")
+            sub_concepto = getattr(vep_data, "sub_concepto", "19")
+            importe = getattr(vep_data, "importe", 0.0)
 
             # Generate PDF using VepPdfGenerator
             pdf_generator = VepPdfGenerator(
-                nro_vep=getattr(vep_data, "nro_formulario", "1571"),
-                cuit=getattr(vep_data, "cuit", "00000000000"),
-                periodo=getattr(vep_data, "periodo_fiscal", "202412"),
+                nro_vep=nro_vep,
+                cuit=cuit,
+                periodo=periodo,
                 items_pago=[
-                    {
-                        "descripcion": f"CONCEPTO {getattr(vep_data, 'concepto', '19')}",
-                        "importe": getattr(vep_data, "importe", 0.0),
-                    }
+                    {"descripcion": f"CONCEPTO {concepto}", "importe": importe}
                 ],
                 organismo_recaudador="ARCA",
                 tipo_pago="Monotributo - Pago Mensual",
-                concepto=(
-                    getattr(vep_data, "concepto", "19"),
-                    "",
-                ),
-                subconcepto=(
-                    getattr(vep_data, "sub_concepto", "19"),
-                    "",
-                ),
-                descripcion_reducida=f"VEP-{getattr(vep_data, 'periodo_fiscal', '202412')}",
+                concepto=(concepto, ""),
+                subconcepto=(sub_concepto, ""),
+                descripcion_reducida=f"VEP-{periodo}",
             )
 
-            # Generate the PDF
+            # Rendered every time: the PDF prints its generation timestamp
             pdf_generator.create_pdf(str(pdf_path))
 
             if pdf_path.exists():
@@ -4,7 +4,7 @@ Retry service for handling failed transactions due to retryable errors.
 
 import asyncio
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Union
 from uuid import UUID
 
 from loguru import logger
@@ -16,9 +16,54 @@ from core.utils.error_classifier import has_retryable_error, is_retryable_error
 from core.workflows.base import WorkflowStatus
 
 
+def _extract_ccma_params(
+    credentials: Dict[str, Any], data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build CCMA workflow parameters from stored request data."""
+    return {
+        "cuit": credentials.get("cuit"),
+        "password": credentials.get("password"),
+        "period_from": data.get("period_from"),
+        "period_to": data.get("period_to"),
+        "calculation_date": data.get("calculation_date"),
+        "tipo_contribuyente": data.get("tipo_contribuyente"),
+        "impuesto": data.get("impuesto"),
+        "form_payment": data.get("form_payment"),
+        "headless": data.get("headless", False),
+    }
+
+
+def _extract_ddjj_params(
+    credentials: Dict[str, Any], data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build DDJJ workflow parameters from stored request data."""
+    return {
+        "cuit": credentials.get("cuit"),
+        "password": credentials.get("password"),
+        "vep_data": data.get("entries", []),
+        "form_payment": data.get("form_payment"),
+        "headless": data.get("headless", False),
+    }
+
+
+def _get_retry_count(transaction_data: Dict[str, Any]) -> int:
+    """Read the retry count, which update_status stores under ``results``."""
+    results = transaction_data.get("results")
+    return results.get("retry_count", 0) if isinstance(results, dict) else 0
+
+
+# Workflow type -> parameter extractor
+_EXTRACTORS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]] = {
+    "ccma_workflow": _extract_ccma_params,
+    "ddjj_workflow": _extract_ddjj_params,
+}
+
+
 class RetryService:
     """Service for retrying failed transactions with retryable errors."""
 
+    _FAILED_STATUS: ClassVar[str] = WorkflowStatus.FAILED.value
+
     def __init__(
         self,
         transaction_service: TransactionService,
@@ -35,13 +80,15 @@ class RetryService:
         self.workflow_orchestrator = workflow_orchestrator
 
     async def get_retryable_transactions(
-        self, max_retries: int = 3
+        self, max_retries: int = 3, use_index: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Get all transactions with retryable failures that haven't exceeded max retries.
 
         Args:
             max_retries: Maximum number of retry attempts allowed
+            use_index: Read Redis through the retryable index instead of scanning
+                every transaction (scan covers records created before the index)
 
         Returns:
             List of retryable transactions
@@ -52,7 +99,7 @@ class RetryService:
             # If using Redis, we need to scan all transaction keys
             if self.transaction_service._redis_client:
                 retryable_transactions = await self._get_retryable_transactions_redis(
-                    max_retries
+                    max_retries, use_index
                 )
             else:
                 # For in-memory storage, check all transactions
@@ -71,10 +118,11 @@ class RetryService:
         """Get retryable transactions from in-memory storage."""
         retryable_transactions = []
 
-        for (
-            exchange_id,
-            transaction_data,
-        ) in self.transaction_service._transactions.items():
+        for exchange_id, record in self.transaction_service._transactions.items():
+            # Only failed records are worth converting to a dict
+            if record.status != self._FAILED_STATUS:
+                continue
+            transaction_data = record.to_dict()
             if self._is_transaction_retryable(transaction_data, max_retries):
                 retryable_transactions.append(
                     {"exchange_id": exchange_id, "data": transaction_data}
@@ -83,29 +131,61 @@ class RetryService:
         return retryable_transactions
 
     async def _get_retryable_transactions_redis(
-        self, max_retries: int
+        self, max_retries: int, use_index: bool = True
     ) -> List[Dict[str, Any]]:
-        """Get retryable transactions from Redis storage."""
+        """
+        Get retryable transactions from Redis storage.
+
+        With ``use_index`` only transactions in the retryable index are read;
+        otherwise every ``transaction:*`` hash is scanned.
+        """
+        if use_index:
+            return await self._get_retryable_transactions_indexed(max_retries)
+
         retryable_transactions = []
 
         try:
-            # Get all transaction keys
-            pattern = "transaction:*"
-            keys = await self.transaction_service._redis_client.keys(pattern)
-
-            # Check each transaction
-            for key in keys:
-                transaction_data = (
-                    await self.transaction_service._redis_client.get_hash(key)
+            # SCAN + pipelined HGETALL: one round-trip per batch, no KEYS stall
+            async for batch in self.transaction_service.scan_transactions():
+                retryable_transactions.extend(
+                    {"exchange_id": exchange_id, "data": transaction_data}
+                    for exchange_id, transaction_data in batch
+                    if self._is_transaction_retryable(transaction_data, max_retries)
+                )
+        except Exception as e:
+            logger.error(f"Error scanning Redis for retryable transactions: {e}")
+
+        return retryable_transactions
+
+    async def _get_retryable_transactions_indexed(
+        self, max_retries: int, batch_size: int = 200
+    ) -> List[Dict[str, Any]]:
+        """Get retryable transactions listed in the Redis retryable index."""
+        retryable_transactions = []
+
+        try:
+            exchange_ids = await self.transaction_service.get_retryable_ids()
+            stale_ids = set(exchange_ids)
+
+            for start in range(0, len(exchange_ids), batch_size):
+                batch = await self.transaction_service.get_transactions(
+                    exchange_ids[start : start + batch_size]
                 )
-                if transaction_data:
-                    exchange_id = key.replace("transaction:", "")
-                    if self._is_transaction_retryable(transaction_data, max_retries):
+                for exchange_id, transaction_data in batch:
+                    # Errors were classified when indexed; re-check the rest
+                    if (
+                        transaction_data.get("status") == self._FAILED_STATUS
+                        and _get_retry_count(transaction_data) < max_retries
+                    ):
+                        stale_ids.discard(exchange_id)
                         retryable_transactions.append(
                             {"exchange_id": exchange_id, "data": transaction_data}
                         )
+
+            # Expired, recovered or exhausted transactions leave the index
+            await self.transaction_service.remove_from_retryable_index(*stale_ids)
         except Exception as e:
-            logger.error(f"Error scanning Redis for retryable transactions: {e}")
+            logger.error(f"Error reading Redis retryable index: {e}")
 
         return retryable_transactions
 
@@ -122,23 +202,18 @@ class RetryService:
         Returns:
             bool: True if transaction is retryable, False otherwise
         """
-        # Check if transaction is in failed status
-        status = transaction_data.get("status")
-        if status != WorkflowStatus.FAILED.value:
+        # Cheapest rejections first: most scanned transactions are not failed
+        if transaction_data.get("status") != self._FAILED_STATUS:
             return False
 
-        # Check retry count
-        retry_count = transaction_data.get("retry_count", 0)
-        if retry_count >= max_retries:
+        if _get_retry_count(transaction_data) >= max_retries:
             return False
 
-        # Check if any error is retryable
-        results = transaction_data.get("results", {})
-        errors = results.get("errors", {})
-
-        return has_retryable_error(errors)
+        # Check if any error is retryable (skip the walk when there are none)
+        errors = transaction_data.get("results", {}).get("errors")
+        return bool(errors) and has_retryable_error(errors)
 
-    async def retry_transaction(self, exchange_id: str) -> bool:
+    async def retry_transaction(self, exchange_id: Union[str, UUID]) -> bool:
         """
         Retry a specific transaction.
 
@@ -148,6 +223,16 @@ class RetryService:
         Returns:
             bool: True if retry was initiated successfully, False otherwise
         """
+        # Parse once: the UUID goes to the orchestrator, the string everywhere else
+        try:
+            exchange_uuid = (
+                exchange_id if isinstance(exchange_id, UUID) else UUID(exchange_id)
+            )
+        except ValueError:
+            logger.error(f"Invalid exchange ID for retry: {exchange_id}")
+            return False
+        exchange_id = str(exchange_uuid)
+
         set_exchange_id(exchange_id)
         try:
             # Get transaction data
@@ -157,22 +242,24 @@ class RetryService:
                 return False
 
             # Increment retry count
-            retry_count = transaction_data.get("retry_count", 0) + 1
+            retry_count = _get_retry_count(transaction_data) + 1
+
+            # Extract workflow type from transaction data or infer from request data
+            workflow_type = self._infer_workflow_type(exchange_id, transaction_data)
 
-            # Update transaction with new retry count
+            # Update transaction with new retry count (and memoized workflow type)
+            retry_results: Dict[str, Any] = {"retry_count": retry_count}
+            if workflow_type:
+                retry_results["workflow_type"] = workflow_type
             await self.transaction_service.update_status(
                 exchange_id=exchange_id,
                 status=WorkflowStatus.PENDING.value,
-                results={"retry_count": retry_count},
+                results=retry_results,
             )
 
             # Get original request data to recreate workflow
             request_data = transaction_data.get("request_data", {})
 
-            # Extract workflow type from transaction data or infer from exchange_id
-            # This would need to be enhanced based on how you track workflow types
-            workflow_type = self._infer_workflow_type(exchange_id, transaction_data)
-
             if not workflow_type:
                 logger.error(
                     f"Could not determine workflow type for transaction {exchange_id}"
@@ -186,7 +273,7 @@ class RetryService:
             success = await self.workflow_orchestrator.execute_workflow_async(
                 workflow_type=workflow_type,
                 workflow_params=workflow_params,
-                exchange_id=UUID(exchange_id),
+                exchange_id=exchange_uuid,
             )
 
             if success:
@@ -217,16 +304,22 @@ class RetryService:
         Returns:
             Workflow type or None if cannot be determined
         """
-        # This is a simplified implementation
-        # In a real implementation, you might store the workflow type explicitly
-        request_data = transaction_data.get("request_data", {})
+        # Reuse the type memoized by a previous retry
+        results = transaction_data.get("results")
+        workflow_type = transaction_data.get("workflow_type") or (
+            results.get("workflow_type") if isinstance(results, dict) else None
+        )
+        if workflow_type:
+            return workflow_type
+
+        data = transaction_data.get("request_data", {}).get("data") or {}
 
         # Check for CCMA workflow indicators
-        if "data" in request_data and "period_from" in request_data["data"]:
+        if "period_from" in data:
             return "ccma_workflow"
 
         # Check for DDJJ workflow indicators
-        if "data" in request_data and "entries" in request_data["data"]:
+        if "entries" in data:
             return "ddjj_workflow"
 
         return None
@@ -244,52 +337,31 @@ class RetryService:
         Returns:
             Dictionary of workflow parameters
         """
-        params = {}
-
-        if workflow_type == "ccma_workflow":
-            # Extract CCMA parameters
-            credentials = request_data.get("credentials", {})
-            data = request_data.get("data", {})
-
-            params.update(
-                {
-                    "cuit": credentials.get("cuit"),
-                    "password": credentials.get("password"),
-                    "period_from": data.get("period_from"),
-                    "period_to": data.get("period_to"),
-                    "calculation_date": data.get("calculation_date"),
-                    "tipo_contribuyente": data.get("tipo_contribuyente"),
-                    "impuesto": data.get("impuesto"),
-                    "form_payment": data.get("form_payment"),
-                    "headless": data.get("headless", False),
-                }
-            )
+        extractor = _EXTRACTORS.get(workflow_type)
+        if not extractor:
+            return {}
 
-        elif workflow_type == "ddjj_workflow":
-            # Extract DDJJ parameters
-            credentials = request_data.get("credentials", {})
-            data = request_data.get("data", {})
-
-            params.update(
-                {
-                    "cuit": credentials.get("cuit"),
-                    "password": credentials.get("password"),
-                    "vep_data": data.get("entries", []),
-                    "form_payment": data.get("form_payment"),
-                    "headless": data.get("headless", False),
-                }
-            )
+        credentials = request_data.get("credentials") or {}
+        data = request_data.get("data") or {}
+        params = extractor(credentials, data)
 
         return {k: v for k, v in params.items() if v is not None}
 
     async def process_retryable_transactions(
-        self, max_retries: int = 3
+        self, max_retries: int = 3, max_concurrency: int = 5, use_index: bool = True
     ) -> Dict[str, int]:
         """
         Process all retryable transactions.
 
+        Retries run concurrently, at most ``max_concurrency`` at a time. Each
+        retry runs in its own task, so its exchange_id logging context is
+        isolated from the others.
+
         Args:
             max_retries: Maximum number of retry attempts allowed
+            max_concurrency: Maximum number of retries in flight at once
+            use_index: Find Redis transactions through the retryable index; set
+                False to scan for transactions that failed before it existed
 
         Returns:
             Dictionary with processing statistics
@@ -298,23 +370,34 @@ class RetryService:
 
         try:
             # Get retryable transactions
-            retryable_transactions = await self.get_retryable_transactions(max_retries)
+            retryable_transactions = await self.get_retryable_transactions(
+                max_retries, use_index
+            )
             stats["total_found"] = len(retryable_transactions)
 
             logger.info(f"Found {stats['total_found']} retryable transactions")
 
-            # Process each transaction
-            for transaction in retryable_transactions:
-                exchange_id = transaction["exchange_id"]
-
-                try:
-                    success = await self.retry_transaction(exchange_id)
-                    if success:
-                        stats["retry_initiated"] += 1
-                    else:
-                        stats["retry_failed"] += 1
-                except Exception as e:
-                    logger.error(f"Error processing transaction {exchange_id}: {e}")
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def _guarded(exchange_id: str) -> bool:
+                async with semaphore:
+                    return await self.retry_transaction(exchange_id)
+
+            exchange_ids = [t["exchange_id"] for t in retryable_transactions]
+            results = await asyncio.gather(
+                *(_guarded(exchange_id) for exchange_id in exchange_ids),
+                return_exceptions=True,
+            )
+
+            for exchange_id, result in zip(exchange_ids, results):
+                if isinstance(result, BaseException):
+                    logger.error(
+                        f"Error processing transaction {exchange_id}: {result}"
+                    )
+                    stats["retry_failed"] += 1
+                elif result:
+                    stats["retry_initiated"] += 1
+                else:
                     stats["retry_failed"] += 1
 
         except Exception as e:
@@ -3,6 +3,7 @@ Selenium monitor - background task for auto-scaling idle nodes down.
 """
 
 import asyncio
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -18,6 +19,16 @@ class SeleniumMonitor:
     Runs as a background task in the FastAPI application.
     """
 
+    __slots__ = (
+        "scaler",
+        "idle_timeout",
+        "check_interval",
+        "_last_activity",
+        "_running",
+        "_activity_event",
+        "_loop",
+    )
+
     def __init__(
         self,
         scaler: Optional[SeleniumScaler] = None,
@@ -30,17 +41,28 @@ class SeleniumMonitor:
         Args:
             scaler: SeleniumScaler instance (creates default if None)
             idle_timeout: Seconds of inactivity before scaling down (default 600 = 10min)
-            check_interval: Seconds between idle checks (default 60)
+            check_interval: Minimum seconds between idle checks (default 60)
         """
         self.scaler = scaler or SeleniumScaler()
         self.idle_timeout = idle_timeout
         self.check_interval = check_interval
-        self.last_activity_time = datetime.now()
+        # Monotonic: idle deltas must not jump with NTP/DST wall-clock changes
+        self._last_activity = time.monotonic()
         self._running = False
+        # Bound to the running loop in start_monitoring
+        self._activity_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def start_monitoring(self):
-        """Start the monitoring loop."""
+        """
+        Start the monitoring loop.
+
+        The loop sleeps until either activity is marked or the idle threshold
+        is reached; the hub is only queried when the idle timer expires.
+        """
         self._running = True
+        self._loop = asyncio.get_running_loop()
+        self._activity_event = asyncio.Event()
         logger.info(
             f"Starting Selenium auto-scaler monitor "
             f"(idle_timeout={self.idle_timeout}s, check_interval={self.check_interval}s)"
@@ -48,7 +70,19 @@ class SeleniumMonitor:
 
         while self._running:
             try:
-                await asyncio.sleep(self.check_interval)
+                remaining = max(
+                    self.idle_timeout - self.get_idle_time(), self.check_interval
+                )
+                try:
+                    await asyncio.wait_for(
+                        self._activity_event.wait(), timeout=remaining
+                    )
+                    # Activity restarted the idle timer; go back to sleep
+                    self._activity_event.clear()
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
                 await self._check_and_scale_down()
 
             except asyncio.CancelledError:
@@ -61,17 +95,19 @@ class SeleniumMonitor:
     async def _check_and_scale_down(self):
         """Check for idle nodes and scale down if necessary."""
         try:
-            # Get current active sessions
-            active_sessions = self.scaler.get_active_sessions_count()
+            # Get current active sessions (blocking HTTP, run off the event loop)
+            active_sessions = await asyncio.to_thread(
+                self.scaler.get_active_sessions_count
+            )
 
             if active_sessions > 0:
                 # Activity detected, update last activity time
-                self.last_activity_time = datetime.now()
+                self._last_activity = time.monotonic()
                 logger.debug(f"Selenium active: {active_sessions} sessions")
                 return
 
             # No active sessions - check idle time
-            idle_time = (datetime.now() - self.last_activity_time).total_seconds()
+            idle_time = self.get_idle_time()
 
             logger.debug(
                 f"Selenium idle for {int(idle_time)}s "
@@ -85,12 +121,12 @@ class SeleniumMonitor:
                 )
 
                 # Scale down by 1 node at a time
-                success = self.scaler.scale_down(1)
+                success = await asyncio.to_thread(self.scaler.scale_down, 1)
 
                 if success:
                     logger.info(f"Scaled down to {self.scaler.current_nodes} nodes")
                     # Reset activity time to avoid immediate next scale-down
-                    self.last_activity_time = datetime.now()
+                    self._last_activity = time.monotonic()
                 else:
                     logger.warning("Failed to scale down nodes")
 
@@ -100,6 +136,7 @@ class SeleniumMonitor:
     def stop_monitoring(self):
         """Stop the monitoring loop."""
         self._running = False
+        self._wake()
         logger.info("Stopping Selenium monitor")
 
     def mark_activity(self):
@@ -108,9 +145,15 @@ class SeleniumMonitor:
 
         Call this when a workflow starts to reset the idle timer.
         """
-        self.last_activity_time = datetime.now()
+        self._last_activity = time.monotonic()
+        self._wake()
         logger.debug("Selenium activity marked")
 
+    def _wake(self):
+        """Wake the monitoring loop; safe to call from any thread."""
+        if self._loop and self._activity_event and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._activity_event.set)
+
     def get_idle_time(self) -> float:
         """
         Get current idle time in seconds.
@@ -118,4 +161,9 @@ class SeleniumMonitor:
         Returns:
             Seconds since last activity
         """
-        return (datetime.now() - self.last_activity_time).total_seconds()
+        return time.monotonic() - self._last_activity
+
+    @property
+    def last_activity_time(self) -> datetime:
+        """Wall-clock time of the last activity (derived from the monotonic clock)."""
+        return datetime.now() - timedelta(seconds=self.get_idle_time())
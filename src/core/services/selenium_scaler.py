@@ -4,12 +4,28 @@ Selenium auto-scaler service - manages dynamic scaling of Selenium Grid nodes.
 
 import os
 import subprocess
+import threading
 import time
+from pathlib import Path
 from typing import Optional
 
 import requests
 from loguru import logger
 
+# Node readiness polling: start fast, back off to the old fixed interval
+READY_POLL_INITIAL = 0.1
+READY_POLL_MAX = 2.0
+READY_POLL_BACKOFF = 1.5
+
+# Project root for docker-compose commands (src/core/services -> root)
+_PROJECT_DIR = str(Path(os.path.abspath(__file__)).parents[3])
+
+# docker-compose invocation; the chrome-node target is appended per call
+_SCALE_ARGV_PREFIX = ("docker-compose", "up", "-d", "--no-recreate", "--scale")
+
+# Hub status younger than this is reused by session counts within one check
+STATUS_CACHE_TTL = 1.0
+
 
 class SeleniumScaler:
     """
@@ -18,6 +34,21 @@ class SeleniumScaler:
     Scales nodes up when workflows need capacity and down when idle.
     """
 
+    __slots__ = (
+        "min_nodes",
+        "max_nodes",
+        "sessions_per_node",
+        "hub_url",
+        "current_nodes",
+        "_project_dir",
+        "_http",
+        "_status_cache",
+        "_status_cached_at",
+        "_scale_lock",
+        "_pending_lock",
+        "_pending_target",
+    )
+
     def __init__(
         self,
         min_nodes: int = 0,
@@ -39,17 +70,15 @@ class SeleniumScaler:
         self.sessions_per_node = sessions_per_node
         self.hub_url = hub_url
         self.current_nodes = 0
-        self._project_dir = self._get_project_directory()
-
-    def _get_project_directory(self) -> str:
-        """Get the project root directory for docker-compose commands."""
-        # Assuming this file is at src/core/services/selenium_scaler.py
-        current_file = os.path.abspath(__file__)
-        # Go up 3 levels: services -> core -> src -> root
-        project_dir = os.path.dirname(
-            os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
-        )
-        return project_dir
+        self._project_dir = _PROJECT_DIR
+        # Keep-alive connection reused for every hub /status query
+        self._http = requests.Session()
+        self._status_cache: Optional[dict] = None
+        self._status_cached_at = 0.0
+        # Concurrent scale requests are coalesced into one docker-compose call
+        self._scale_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending_target: Optional[int] = None
 
     def scale_up(self, count: int = 1) -> bool:
         """
@@ -67,42 +96,7 @@ class SeleniumScaler:
             logger.debug(f"Already at {self.current_nodes} nodes, not scaling up")
             return True
 
-        logger.info(f"Scaling Selenium nodes from {self.current_nodes} to {target}")
-
-        try:
-            # Use docker-compose scale command
-            result = subprocess.run(
-                [
-                    "docker-compose",
-                    "up",
-                    "-d",
-                    "--scale",
-                    f"chrome-node={target}",
-                    "--no-recreate",
-                ],
-                cwd=self._project_dir,
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-
-            if result.returncode == 0:
-                self.current_nodes = target
-                logger.info(f"Successfully scaled to {target} nodes")
-
-                # Wait for nodes to register with hub
-                self._wait_for_nodes_ready(target, timeout=30)
-                return True
-            else:
-                logger.error(f"Failed to scale nodes: {result.stderr}")
-                return False
-
-        except subprocess.TimeoutExpired:
-            logger.error("Docker-compose scale command timed out")
-            return False
-        except Exception as e:
-            logger.error(f"Error scaling nodes: {e}")
-            return False
+        return self._scale_to(target)
 
     def scale_down(self, count: int = 1) -> bool:
         """
@@ -120,35 +114,68 @@ class SeleniumScaler:
             logger.debug(f"Already at {self.current_nodes} nodes, not scaling down")
             return True
 
-        logger.info(f"Scaling Selenium nodes from {self.current_nodes} to {target}")
+        return self._scale_to(target)
 
-        try:
-            result = subprocess.run(
-                [
-                    "docker-compose",
-                    "up",
-                    "-d",
-                    "--scale",
-                    f"chrome-node={target}",
-                    "--no-recreate",
-                ],
-                cwd=self._project_dir,
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
+    def _scale_to(self, target: int) -> bool:
+        """
+        Scale chrome-node containers to target, coalescing concurrent requests.
+
+        Requests that arrive while docker-compose is running are merged (the
+        largest target wins, so capacity is never dropped) and applied by the
+        next lock holder with a single invocation.
 
-            if result.returncode == 0:
-                self.current_nodes = target
-                logger.info(f"Successfully scaled down to {target} nodes")
+        Args:
+            target: Desired number of nodes
+
+        Returns:
+            True if scaling succeeded, False otherwise
+        """
+        with self._pending_lock:
+            if self._pending_target is None or target > self._pending_target:
+                self._pending_target = target
+
+        with self._scale_lock:
+            with self._pending_lock:
+                target, self._pending_target = self._pending_target, None
+
+            # A previous holder already applied this request
+            if target is None or target == self.current_nodes:
                 return True
-            else:
-                logger.error(f"Failed to scale down nodes: {result.stderr}")
+
+            scaling_up = target > self.current_nodes
+            logger.info(f"Scaling Selenium nodes from {self.current_nodes} to {target}")
+
+            try:
+                result = self._run_scale(target)
+
+                if result.returncode == 0:
+                    self.current_nodes = target
+                    logger.info(f"Successfully scaled to {target} nodes")
+
+                    if scaling_up:
+                        # Wait for nodes to register with hub
+                        self._wait_for_nodes_ready(target, timeout=30)
+                    return True
+                else:
+                    logger.error(f"Failed to scale nodes: {result.stderr}")
+                    return False
+
+            except subprocess.TimeoutExpired:
+                logger.error("Docker-compose scale command timed out")
+                return False
+            except Exception as e:
+                logger.error(f"Error scaling nodes: {e}")
                 return False
 
-        except Exception as e:
-            logger.error(f"Error scaling down nodes: {e}")
-            return False
+    def _run_scale(self, target: int) -> subprocess.CompletedProcess:
+        """Run the docker-compose scale command for the chrome-node service."""
+        return subprocess.run(
+            [*_SCALE_ARGV_PREFIX, f"chrome-node={target}"],
+            cwd=self._project_dir,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
 
     def ensure_capacity(self, sessions_needed: int) -> bool:
         """
@@ -188,12 +215,13 @@ class SeleniumScaler:
         Returns:
             True if nodes are ready, False if timeout
         """
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+        delay = READY_POLL_INITIAL
 
-        while time.time() - start_time < timeout:
+        while time.monotonic() < deadline:
             try:
                 # Query hub status
-                response = requests.get(f"{self.hub_url}/status", timeout=5)
+                response = self._http.get(f"{self.hub_url}/status", timeout=5)
 
                 if response.status_code == 200:
                     data = response.json()
@@ -213,23 +241,34 @@ class SeleniumScaler:
             except Exception as e:
                 logger.debug(f"Error checking hub status: {e}")
 
-            time.sleep(2)
+            # Never sleep past the deadline
+            time.sleep(max(min(delay, deadline - time.monotonic()), 0))
+            delay = min(delay * READY_POLL_BACKOFF, READY_POLL_MAX)
 
         logger.warning(f"Timeout waiting for {expected_nodes} nodes to be ready")
         return False
 
-    def get_hub_status(self) -> Optional[dict]:
+    def get_hub_status(self, max_age: float = 0.0) -> Optional[dict]:
         """
         Get current Selenium Hub status.
 
+        Args:
+            max_age: Reuse a previous status fetched at most this many seconds ago
+
         Returns:
             Hub status dictionary or None if error
         """
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cached_at < max_age:
+            return self._status_cache
+
         try:
-            response = requests.get(f"{self.hub_url}/status", timeout=5)
+            response = self._http.get(f"{self.hub_url}/status", timeout=5)
 
             if response.status_code == 200:
-                return response.json()
+                self._status_cache = response.json()
+                self._status_cached_at = now
+                return self._status_cache
 
         except Exception as e:
             logger.error(f"Error getting hub status: {e}")
@@ -243,21 +282,21 @@ class SeleniumScaler:
         Returns:
             Number of active sessions, or 0 if error
         """
-        status = self.get_hub_status()
-
-        if status:
-            # Check if hub is ready (no active sessions means ready=true)
-            ready = status.get("value", {}).get("ready", True)
-
-            if not ready:
-                # Hub not ready means sessions are active
-                # Count sessions from nodes
-                nodes = status.get("value", {}).get("nodes", [])
-                total_sessions = sum(
-                    len(node.get("slots", []))
-                    for node in nodes
-                    if node.get("availability") != "DOWN"
+        status = self.get_hub_status(max_age=STATUS_CACHE_TTL)
+
+        if not status:
+            return 0
+
+        value = status.get("value") or {}
+        total_sessions = 0
+        for node in value.get("nodes") or ():
+            if node.get("availability") != "UP":
+                continue
+            # Count busy slots only; idle slots must not look like activity
+            session_count = node.get("sessionCount")
+            if session_count is None:
+                session_count = sum(
+                    1 for slot in node.get("slots") or () if slot.get("session")
                 )
-                return total_sessions
-
-        return 0
+            total_sessions += session_count
+        return total_sessions
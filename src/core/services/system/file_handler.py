@@ -2,18 +2,27 @@
 File handler that consolidates all file management operations.
 """
 
+import fnmatch
+import os
 import shutil
 import time
 from pathlib import Path
 from typing import Optional, Set
 
-from cryptography.fernet import Fernet
 from loguru import logger
 
+from core.utils.file_utils import ensure_dir, write_bytes
+
+# Polling fallback: first rescan delay, doubled up to the cap
+POLL_INITIAL_DELAY = 0.05
+POLL_MAX_DELAY = 0.5
+
 
 class FileHandler:
     """Unified file handler for all file operations."""
 
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -28,12 +37,27 @@ class FileHandler:
         Returns:
             Set of matching file paths
         """
-        try:
-            if not directory.exists():
-                logger.warning(f"Directory does not exist: {directory}")
-                return set()
+        # "*.ext" patterns only need a suffix check; anything else uses fnmatch
+        suffix = pattern[1:]
+        if not pattern.startswith("*") or any(c in suffix for c in "*?["):
+            suffix = None
 
-            return set(directory.glob(pattern))
+        try:
+            # scandir yields names and file types in one pass, without Path per entry
+            with os.scandir(directory) as entries:
+                return {
+                    Path(entry.path)
+                    for entry in entries
+                    if (
+                        entry.name.endswith(suffix)
+                        if suffix is not None
+                        else fnmatch.fnmatchcase(entry.name, pattern)
+                    )
+                    and entry.is_file(follow_symlinks=False)
+                }
+        except FileNotFoundError:
+            logger.warning(f"Directory does not exist: {directory}")
+            return set()
         except Exception as e:
             logger.error(f"Error getting files snapshot: {e}")
             return set()
@@ -54,28 +78,34 @@ class FileHandler:
             Path to new file, or None if timeout
         """
         logger.info(f"Waiting for new {pattern} file in {directory}")
-        wait_interval = 0.5  # Check more frequently
-        elapsed_time = 0
 
-        while elapsed_time < timeout:
-            time.sleep(wait_interval)
-            elapsed_time += wait_interval
+        # Probe before sleeping so an already-finished download returns at once,
+        # then back off between rescans
+        deadline = time.monotonic() + timeout
+        delay = POLL_INITIAL_DELAY
+        download_logged = False
 
+        while True:
             # Check for new files
             current_files = self.get_files_snapshot(directory, pattern)
             new_files = current_files - initial_files
 
             if new_files:
-                new_file = list(new_files)[0]  # Get the first new file
+                new_file = next(iter(new_files))  # Get the first new file
                 logger.info(f"New file detected: {new_file.name}")
                 return new_file
 
             # Check for incomplete downloads
-            if pattern == "*.pdf":
-                crdownload_files = list(directory.glob("*.crdownload"))
-                if crdownload_files:
+            if pattern == "*.pdf" and not download_logged:
+                if self.get_files_snapshot(directory, "*.crdownload"):
                     logger.info("Download in progress (found .crdownload file)")
-                    continue
+                    download_logged = True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, POLL_MAX_DELAY)
 
         logger.warning(f"File wait timeout after {timeout} seconds")
         return None
@@ -131,11 +161,10 @@ class FileHandler:
             True if file was saved successfully
         """
         try:
-            # Ensure parent directory exists
-            filepath.parent.mkdir(parents=True, exist_ok=True)
+            # Ensure parent directory exists (once per process)
+            ensure_dir(filepath.parent)
 
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(content)
+            write_bytes(filepath, content.encode("utf-8"))
 
             logger.info(f"Text file saved: {filepath}")
             return True
@@ -155,11 +184,10 @@ class FileHandler:
             True if file was saved successfully
         """
         try:
-            # Ensure parent directory exists
-            filepath.parent.mkdir(parents=True, exist_ok=True)
+            # Ensure parent directory exists (once per process)
+            ensure_dir(filepath.parent)
 
-            with open(filepath, "wb") as f:
-                f.write(data)
+            write_bytes(filepath, data)
 
             logger.info(f"Binary file saved: {filepath}")
             return True
@@ -179,15 +207,12 @@ class FileHandler:
             Decrypted content as bytes
         """
         try:
-            # Initialize the Fernet object
-            fernet = Fernet(key)
-
-            # Read the encrypted content
+            # Read the encrypted content in one allocation. Fernet only accepts
+            # bytes/str tokens, so an mmap would still be copied into bytes.
             with open(file_path, "rb") as encrypted_file:
                 encrypted_content = encrypted_file.read()
 
-            # Decrypt the content using Fernet
-            decrypted_content = fernet.decrypt(encrypted_content)
+            decrypted_content = self.decrypt_content(encrypted_content, key)
 
             logger.info(f"File decrypted successfully: {file_path}")
             return decrypted_content
@@ -195,3 +220,19 @@ class FileHandler:
         except Exception as e:
             logger.error(f"Error decrypting file {file_path}: {e}")
             raise e
+
+    def decrypt_content(self, encrypted_content: bytes, key: str) -> bytes:
+        """
+        Decrypt in-memory content using Fernet symmetric encryption.
+
+        Args:
+            encrypted_content: Fernet token bytes
+            key: Fernet key to use for decryption
+
+        Returns:
+            Decrypted content as bytes
+        """
+        # Deferred: cryptography is only needed when content is decrypted
+        from cryptography.fernet import Fernet
+
+        return Fernet(key).decrypt(encrypted_content)
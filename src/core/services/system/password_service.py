@@ -2,11 +2,15 @@
 Password service for retrieving ARCA credentials from encrypted Excel file.
 """
 
+import hashlib
 import io
+import json
+import os
+import threading
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Optional
 
-import pandas as pd
 from loguru import logger
 
 from core.exceptions.password_exceptions import (
@@ -16,9 +20,51 @@ from core.exceptions.password_exceptions import (
 )
 from core.services.system.file_handler import FileHandler
 
+# Raw cell texts pandas' read_excel parsed as NaN (its default na_values), so
+# rows holding them were dropped before the sheet moved to openpyxl
+_NA_CELLS = frozenset(
+    {
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    }
+)
+# Values still dropped after stripping, as the pandas version filtered them
+_BLANK_CELLS = frozenset({"", "nan"})
+
+# Parsed password maps, re-encrypted with the service key and keyed by the
+# SHA-256 of the source ciphertext (any edit to the workbook invalidates it)
+_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "arca-bot"
+# Part of the cache filename; bump whenever parsing changes the resulting map
+_CACHE_FORMAT_VERSION = 2
+
 
 class PasswordService:
-    """Service for retrieving passwords from encrypted Excel file using pandas."""
+    """Service for retrieving passwords from encrypted Excel file using openpyxl."""
+
+    __slots__ = (
+        "fernet_key",
+        "excel_file_path",
+        "file_handler",
+        "_password_cache",
+        "_load_lock",
+    )
 
     def __init__(
         self, fernet_key: str, excel_file_path: str = "./resources/claves/claves.xlsx"
@@ -34,13 +80,15 @@ class PasswordService:
         self.excel_file_path = Path(excel_file_path)
         self.file_handler = FileHandler()
         self._password_cache: Optional[Dict[str, str]] = None
+        # Single-flight guard so concurrent first calls load the file once
+        self._load_lock = threading.Lock()
         logger.info(
             f"PasswordService initialized with Excel file: {self.excel_file_path}"
         )
 
     def _load_passwords(self) -> Dict[str, str]:
         """
-        Load and decrypt passwords from Excel file using pandas.
+        Load and decrypt passwords from Excel file in a single streaming pass.
 
         Returns:
             Dictionary mapping CUIT to password
@@ -49,65 +97,92 @@ class PasswordService:
             PasswordDecryptionError: If file cannot be decrypted
             PasswordFileError: If file cannot be parsed or has invalid structure
         """
+        # Deferred: only processes that actually load passwords pay for openpyxl
+        from openpyxl import load_workbook
+
         try:
             logger.info("Loading passwords from encrypted Excel file")
 
-            # Decrypt the Excel file
+            # Decrypt the Excel file (or reuse the map parsed from this exact file)
             try:
-                decrypted_content = self.file_handler.decrypt_file(
-                    self.excel_file_path, self.fernet_key
+                encrypted_content = self.excel_file_path.read_bytes()
+                digest = hashlib.sha256(encrypted_content).hexdigest()
+                cache_path = (
+                    _CACHE_DIR / f"passwords-v{_CACHE_FORMAT_VERSION}-{digest}.bin"
                 )
-            except Exception as e:
-                logger.error(f"Failed to decrypt password file: {e}")
-                raise PasswordDecryptionError(details={"original_error": str(e)})
 
-            # Read Excel content from decrypted bytes using pandas
-            excel_data = io.BytesIO(decrypted_content)
-            df = pd.read_excel(excel_data, engine="openpyxl")
+                cached_map = self._read_cached_passwords(cache_path)
+                if cached_map is not None:
+                    logger.info(
+                        f"Loaded {len(cached_map)} password entries from local cache"
+                    )
+                    return cached_map
 
-            logger.info(f"Excel file loaded with columns: {list(df.columns)}")
-            logger.info(f"Excel file has {len(df)} rows")
-
-            # Use specific column names based on actual Excel structure
-            cuit_col = "cuit"
-            password_col = "clave"
-
-            if cuit_col not in df.columns:
-                raise PasswordFileError(
-                    f"CUIT column '{cuit_col}' not found. Available columns: {list(df.columns)}",
-                    details={"available_columns": list(df.columns)},
-                )
-            if password_col not in df.columns:
-                raise PasswordFileError(
-                    f"Password column '{password_col}' not found. Available columns: {list(df.columns)}",
-                    details={"available_columns": list(df.columns)},
+                decrypted_content = self.file_handler.decrypt_content(
+                    encrypted_content, self.fernet_key
                 )
+            except Exception as e:
+                logger.error(f"Failed to decrypt password file: {e}")
+                raise PasswordDecryptionError(details={"original_error": str(e)})
 
-            logger.info(
-                f"Using CUIT column: '{cuit_col}', Password column: '{password_col}'"
+            # Stream the first sheet from the decrypted bytes (header row first)
+            workbook = load_workbook(
+                io.BytesIO(decrypted_content), read_only=True, data_only=True
             )
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                columns = list(next(rows, ()))
+
+                logger.info(f"Excel file loaded with columns: {columns}")
+
+                # Use specific column names based on actual Excel structure
+                cuit_col = "cuit"
+                password_col = "clave"
+
+                if cuit_col not in columns:
+                    raise PasswordFileError(
+                        f"CUIT column '{cuit_col}' not found. Available columns: {columns}",
+                        details={"available_columns": columns},
+                    )
+                if password_col not in columns:
+                    raise PasswordFileError(
+                        f"Password column '{password_col}' not found. Available columns: {columns}",
+                        details={"available_columns": columns},
+                    )
+
+                logger.info(
+                    f"Using CUIT column: '{cuit_col}', Password column: '{password_col}'"
+                )
 
-            # Build CUIT -> password mapping using pandas operations
-            # Filter out NaN values and convert to string
-            df_clean = df[[cuit_col, password_col]].dropna()
-            df_clean[cuit_col] = df_clean[cuit_col].astype(str).str.strip()
-            df_clean[password_col] = df_clean[password_col].astype(str).str.strip()
-
-            # Remove empty strings and 'nan' values
-            df_clean = df_clean[
-                (df_clean[cuit_col] != "")
-                & (df_clean[cuit_col] != "nan")
-                & (df_clean[password_col] != "")
-                & (df_clean[password_col] != "nan")
-            ]
-
-            # Convert to dictionary
-            password_map = df_clean.set_index(cuit_col)[password_col].to_dict()
+                cuit_idx = columns.index(cuit_col)
+                password_idx = columns.index(password_col)
+                width = max(cuit_idx, password_idx) + 1
+
+                # Build CUIT -> password mapping, skipping blank cells
+                password_map = {}
+                for row in rows:
+                    if len(row) < width:
+                        continue
+                    cuit, password = row[cuit_idx], row[password_idx]
+                    if (
+                        cuit is None
+                        or password is None
+                        or cuit in _NA_CELLS
+                        or password in _NA_CELLS
+                    ):
+                        continue
+                    cuit, password = str(cuit).strip(), str(password).strip()
+                    if cuit not in _BLANK_CELLS and password not in _BLANK_CELLS:
+                        password_map[cuit] = password
+            finally:
+                workbook.close()
 
             logger.info(f"Loaded {len(password_map)} password entries from Excel file")
-            logger.debug(
-                f"Available CUITs: {list(password_map.keys())[:5]}..."
-            )  # Show first 5 for debugging
+            self._write_cached_passwords(cache_path, password_map)
+            # Show first 5 for debugging; only evaluated when DEBUG is enabled
+            logger.opt(lazy=True).debug(
+                "Available CUITs: {}...", lambda: list(islice(password_map, 5))
+            )
 
             return password_map
 
@@ -121,6 +196,51 @@ class PasswordService:
                 details={"original_error": str(e), "error_type": type(e).__name__},
             )
 
+    def _read_cached_passwords(self, cache_path: Path) -> Optional[Dict[str, str]]:
+        """Return the cached password map, or None on a miss or unreadable cache."""
+        if not cache_path.exists():
+            return None
+        try:
+            decrypted = self.file_handler.decrypt_content(
+                cache_path.read_bytes(), self.fernet_key
+            )
+            return json.loads(decrypted)
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable password cache {cache_path.name}: {e}")
+            return None
+
+    def _write_cached_passwords(
+        self, cache_path: Path, password_map: Dict[str, str]
+    ) -> None:
+        """Persist the password map encrypted with the service key (owner-only)."""
+        from cryptography.fernet import Fernet
+
+        try:
+            token = Fernet(self.fernet_key).encrypt(json.dumps(password_map).encode())
+            cache_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as cache_file:
+                cache_file.write(token)
+            os.replace(tmp_path, cache_path)
+
+            # Drop maps cached for previous workbooks or cache formats
+            for stale in cache_path.parent.glob("passwords-*.bin"):
+                if stale != cache_path:
+                    stale.unlink(missing_ok=True)
+        except Exception as e:
+            logger.debug(f"Could not write password cache: {e}")
+
+    def _get_password_map(self) -> Dict[str, str]:
+        """Return the cached password map, loading it once under a lock."""
+        password_map = self._password_cache
+        if password_map is None:
+            with self._load_lock:
+                password_map = self._password_cache
+                if password_map is None:
+                    password_map = self._password_cache = self._load_passwords()
+        return password_map
+
     def get_password(self, cuit: str) -> str:
         """
         Get password for a given CUIT.
@@ -134,20 +254,19 @@ class PasswordService:
         Raises:
             PasswordNotFoundError: If CUIT is not found in the password file
         """
-        # Load passwords if not cached
-        if self._password_cache is None:
-            self._password_cache = self._load_passwords()
+        password_map = self._get_password_map()
 
         # Clean and normalize CUIT for lookup
         clean_cuit = str(cuit).strip()
 
-        if clean_cuit in self._password_cache:
+        if clean_cuit in password_map:
             logger.debug(f"Password found for CUIT: {clean_cuit}")
-            return self._password_cache[clean_cuit]
+            return password_map[clean_cuit]
         else:
             logger.warning(f"Password not found for CUIT: {clean_cuit}")
-            logger.debug(
-                f"Available CUITs in cache: {list(self._password_cache.keys())[:10]}..."
+            logger.opt(lazy=True).debug(
+                "Available CUITs in cache: {}...",
+                lambda: list(islice(password_map, 10)),
             )
             raise PasswordNotFoundError(clean_cuit)
 
@@ -157,8 +276,9 @@ class PasswordService:
         Useful if the Excel file has been updated.
         """
         logger.info("Reloading passwords from Excel file")
-        self._password_cache = None
-        self._password_cache = self._load_passwords()
+        with self._load_lock:
+            # Swap in the new map only once it is fully loaded
+            self._password_cache = self._load_passwords()
 
     def clear_cache(self) -> None:
         """Clear password cache from memory."""
@@ -188,10 +308,9 @@ class PasswordService:
         Returns:
             Dictionary with password cache statistics
         """
-        if self._password_cache is None:
-            self._password_cache = self._load_passwords()
+        password_map = self._get_password_map()
 
         return {
-            "total_passwords": len(self._password_cache),
+            "total_passwords": len(password_map),
             "cache_loaded": self._password_cache is not None,
         }
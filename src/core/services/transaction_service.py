@@ -4,16 +4,100 @@ Responsible only for transaction management and storage.
 """
 
 import asyncio
+import copy
 import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from loguru import logger
 
 from core.observability import record_transaction_operation
+from core.utils.error_classifier import has_retryable_error
 from core.workflows.base import WorkflowStatus
 
+# Redis set of exchange IDs that failed with a retryable error
+RETRYABLE_INDEX_KEY = "transactions:failed_retryable"
+
+# Each results entry is its own transaction hash field ("res_<key>" -> JSON), so
+# status updates write only what changed instead of re-encoding all results
+RESULTS_FIELD_PREFIX = "res_"
+
+# Stores a transaction hash plus its duplicate-check mapping, both with TTL.
+# KEYS: transaction:<id>, transaction_hashes
+# ARGV: ttl, hash index field, exchange_id, field1, value1, ...
+_CREATE_TRANSACTION_SCRIPT = """
+redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('HSET', KEYS[2], ARGV[2], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return 1
+"""
+
+# Hex digits of the (sha256) transaction hash kept as the "transaction_hashes"
+# field: 64 bits, so a false duplicate needs ~4e9 live transactions to be likely
+_HASH_INDEX_FIELD_LENGTH = 16
+
+
+def _hash_index_field(transaction_hash: str) -> str:
+    """Compact duplicate-index field for a transaction hash."""
+    return transaction_hash[:_HASH_INDEX_FIELD_LENGTH]
+
+
+# Redis get_transaction reads are reused this long (seconds) for polling clients
+TRANSACTION_CACHE_TTL = 0.5
+TRANSACTION_CACHE_SIZE = 10_000
+
+# Timestamps are reused for this long; writes rarely need finer resolution
+_TIMESTAMP_CACHE_TTL = 0.1
+# (monotonic time, ISO timestamp) swapped as one tuple so readers never see a mix
+_timestamp_cache: Tuple[float, str] = (float("-inf"), "")
+
+
+def _now_iso() -> str:
+    """Return the current local time in ISO format, cached for a short TTL."""
+    global _timestamp_cache
+    cached_at, timestamp = _timestamp_cache
+    now = time.monotonic()
+    if now - cached_at > _TIMESTAMP_CACHE_TTL:
+        timestamp = datetime.now().isoformat()
+        _timestamp_cache = (now, timestamp)
+    return timestamp
+
+
+@dataclass(slots=True)
+class TransactionRecord:
+    """In-memory transaction; ``to_dict`` gives the same shape as Redis reads."""
+
+    status: str
+    transaction_hash: str
+    exchange_id: str
+    created_at: str
+    request_data: Dict[str, Any]
+    ttl_seconds: int
+    results: Optional[Dict[str, Any]] = None
+    updated_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Transaction data as returned to callers (unset fields omitted)."""
+        data = {
+            "status": self.status,
+            "transaction_hash": self.transaction_hash,
+            "exchange_id": self.exchange_id,
+            "created_at": self.created_at,
+            "request_data": self.request_data,
+            "ttl_seconds": self.ttl_seconds,
+        }
+        if self.results is not None:
+            data["results"] = self.results
+        if self.updated_at is not None:
+            data["updated_at"] = self.updated_at
+        return data
+
 
 class TransactionService:
     """
@@ -27,8 +111,13 @@ class TransactionService:
     """
 
     def __init__(self, redis_url: Optional[str] = None, use_redis: bool = False):
-        self._transactions: Dict[str, Dict[str, Any]] = {}
+        self._transactions: Dict[str, TransactionRecord] = {}
+        # Hash index field -> exchange_id, the in-memory "transaction_hashes"
+        self._hash_index: Dict[str, str] = {}
         self._redis_client = None
+        # exchange_id -> (expires_at, transaction_data), least recently used first
+        self._read_cache: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._read_cache_lock = threading.Lock()
 
         # Initialize Redis if enabled
         if use_redis and redis_url:
@@ -49,8 +138,8 @@ class TransactionService:
         if self._redis_client:
             try:
                 # Use hash lookup for fast indexing
-                existing_id = await self._redis_client.get_hash_field(
-                    "transaction_hashes", transaction_hash
+                (existing_id,) = await self._get_indexed_exchange_ids(
+                    [transaction_hash]
                 )
                 if existing_id:
                     # Record duplicate transaction metric
@@ -64,14 +153,65 @@ class TransactionService:
                 return None
         else:
             # Memory storage
-            for exchange_id, data in self._transactions.items():
-                if data.get("transaction_hash") == transaction_hash:
-                    # Record duplicate transaction metric
-                    record_transaction_operation("duplicate_check", "duplicate")
-                    return exchange_id
-            # Record successful duplicate check metric
-            record_transaction_operation("duplicate_check", "success")
-            return None
+            exchange_id = self._hash_index.get(_hash_index_field(transaction_hash))
+            if exchange_id:
+                # Record duplicate transaction metric
+                record_transaction_operation("duplicate_check", "duplicate")
+            else:
+                # Record successful duplicate check metric
+                record_transaction_operation("duplicate_check", "success")
+            return exchange_id
+
+    async def check_duplicates(
+        self, transaction_hashes: List[str]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Check several transaction hashes at once.
+
+        Args:
+            transaction_hashes: Hashes to look up
+
+        Returns:
+            Mapping of each hash to its existing exchange_id, or None if new
+        """
+        if self._redis_client:
+            existing_ids = await self._get_indexed_exchange_ids(transaction_hashes)
+        else:
+            existing_ids = [
+                self._hash_index.get(_hash_index_field(h)) for h in transaction_hashes
+            ]
+
+        for existing_id in existing_ids:
+            record_transaction_operation(
+                "duplicate_check", "duplicate" if existing_id else "success"
+            )
+        return dict(zip(transaction_hashes, existing_ids))
+
+    async def _get_indexed_exchange_ids(
+        self, transaction_hashes: List[str]
+    ) -> List[Optional[str]]:
+        """
+        Look hashes up in the Redis "transaction_hashes" index with one HMGET.
+
+        Full-length fields written before the index used compact fields are
+        still read, so duplicates created before that change are not missed.
+        """
+        fields = [_hash_index_field(h) for h in transaction_hashes]
+        # Hashes no longer than the prefix are their own field: nothing legacy
+        legacy_fields = [h for h, f in zip(transaction_hashes, fields) if h != f]
+        values = await self._redis_client.get_hash_fields(
+            "transaction_hashes", fields + legacy_fields
+        )
+
+        count = len(fields)
+        legacy_values = iter(values[count:])
+        exchange_ids = []
+        for transaction_hash, field, compact in zip(
+            transaction_hashes, fields, values[:count]
+        ):
+            legacy = next(legacy_values) if transaction_hash != field else None
+            exchange_ids.append(compact or legacy)
+        return exchange_ids
 
     async def create_transaction(
         self,
@@ -86,34 +226,40 @@ class TransactionService:
             "status": WorkflowStatus.CREATED.value,
             "transaction_hash": transaction_hash,
             "exchange_id": exchange_id,
-            "created_at": datetime.now().isoformat(),
+            "created_at": _now_iso(),
             "request_data": request_data,
             "ttl_seconds": ttl_seconds,  # Store original TTL for later use
         }
 
         if self._redis_client:
             try:
-                # Use pipeline for atomic operations
-                async def pipeline_ops(pipe):
-                    # Store transaction data as hash
-                    await pipe.hset(
-                        f"transaction:{exchange_id}",
-                        mapping={
-                            k: (
-                                json.dumps(v, default=str)
-                                if isinstance(v, dict)
-                                else str(v)
-                            )
-                            for k, v in transaction_data.items()
-                        },
-                    )
-                    await pipe.expire(f"transaction:{exchange_id}", ttl_seconds)
-
-                    # Store hash->exchange_id mapping
-                    await pipe.hset("transaction_hashes", transaction_hash, exchange_id)
-                    await pipe.expire("transaction_hashes", ttl_seconds)
-
-                success = await self._redis_client.pipeline_execute([pipeline_ops])
+                # Only request_data needs JSON; the other fields are already
+                # strings. Data and hash->exchange_id mapping are then stored
+                # atomically in a single script call
+                args = [
+                    ttl_seconds,
+                    _hash_index_field(transaction_hash),
+                    exchange_id,
+                    "status",
+                    transaction_data["status"],
+                    "transaction_hash",
+                    transaction_hash,
+                    "exchange_id",
+                    exchange_id,
+                    "created_at",
+                    transaction_data["created_at"],
+                    "request_data",
+                    json.dumps(request_data, default=str),
+                    "ttl_seconds",
+                    str(ttl_seconds),
+                ]
+
+                result = await self._redis_client.run_script(
+                    _CREATE_TRANSACTION_SCRIPT,
+                    keys=[f"transaction:{exchange_id}", "transaction_hashes"],
+                    args=args,
+                )
+                success = result == 1
                 if success:
                     # Record transaction creation success metric
                     record_transaction_operation("creation", "success")
@@ -125,7 +271,8 @@ class TransactionService:
                 logger.error(f"Redis error creating transaction: {e}")
                 return False
         else:
-            self._transactions[exchange_id] = transaction_data
+            self._transactions[exchange_id] = TransactionRecord(**transaction_data)
+            self._hash_index[_hash_index_field(transaction_hash)] = exchange_id
             # Record transaction creation success metric
             record_transaction_operation("creation", "success")
             return True
@@ -136,91 +283,185 @@ class TransactionService:
         """Update transaction status and optionally add results."""
         if self._redis_client:
             try:
-                # Check if transaction exists first
-                key_exists = await self._redis_client.exists(
-                    f"transaction:{exchange_id}"
+                # Only the stored TTL is needed; status is read alongside as the
+                # existence check (one round-trip)
+                ttl_value, current_status = await self._redis_client.get_hash_fields(
+                    f"transaction:{exchange_id}", ["ttl_seconds", "status"]
                 )
-                logger.info(f"Transaction {exchange_id} key exists: {key_exists}")
-                if not key_exists:
+                if current_status is None:
                     logger.warning(f"Transaction {exchange_id} not found in Redis")
                     return False
 
-                # Get existing data for TTL and result merging
-                existing_data = await self._redis_client.get_hash(
-                    f"transaction:{exchange_id}"
-                )
-
-                # Update fields directly in hash
-                updates = {"status": status, "updated_at": datetime.now().isoformat()}
+                # Update fields directly in hash; results entries overwrite
+                # their own fields, which preserves the others (e.g. retry count)
+                updates = {"status": status, "updated_at": _now_iso()}
                 if results:
-                    # Merge results with existing results to preserve retry count
-                    existing_results = {}
-                    if "results" in existing_data:
-                        try:
-                            existing_results = json.loads(existing_data["results"])
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-
-                    # Merge new results with existing results
-                    merged_results = {**existing_results, **results}
-                    updates["results"] = json.dumps(merged_results, default=str)
+                    updates.update(self._encode_results(results))
 
                 logger.info(f"Updating transaction {exchange_id} with: {updates}")
 
                 # Use stored TTL from creation
-                ttl_seconds = int(existing_data.get("ttl_seconds", 3600))
+                ttl_seconds = int(ttl_value or 3600)
+
+                # Keep the retryable index in sync so retry sweeps skip the scan
+                index_retryable = self._retryable_index_membership(status, results)
 
-                # Use pipeline for atomic updates
+                # Batch the hash write and index updates into one round-trip;
+                # each command is idempotent, so MULTI/EXEC is not needed
                 async def pipeline_ops(pipe):
-                    for field, value in updates.items():
-                        await pipe.hset(f"transaction:{exchange_id}", field, value)
+                    await pipe.hset(f"transaction:{exchange_id}", mapping=updates)
                     await pipe.expire(f"transaction:{exchange_id}", ttl_seconds)
+                    if index_retryable is True:
+                        await pipe.sadd(RETRYABLE_INDEX_KEY, exchange_id)
+                    elif index_retryable is False:
+                        await pipe.srem(RETRYABLE_INDEX_KEY, exchange_id)
 
-                success = await self._redis_client.pipeline_execute([pipeline_ops])
+                success = await self._redis_client.pipeline_execute(
+                    [pipeline_ops], transaction=False
+                )
+                self._invalidate_cached_transaction(exchange_id)
                 logger.info(f"Redis update success for {exchange_id}: {success}")
                 return success
             except Exception as e:
                 logger.error(f"Redis error updating status: {e}")
                 return False
         else:
-            if exchange_id in self._transactions:
-                self._transactions[exchange_id]["status"] = status
+            record = self._transactions.get(exchange_id)
+            if record is not None:
+                record.status = status
                 if results:
                     # Merge results with existing results to preserve retry count
-                    existing_results = self._transactions[exchange_id].get(
-                        "results", {}
-                    )
-                    merged_results = {**existing_results, **results}
-                    self._transactions[exchange_id]["results"] = merged_results
-                self._transactions[exchange_id][
-                    "updated_at"
-                ] = datetime.now().isoformat()
+                    record.results = {**(record.results or {}), **results}
+                record.updated_at = _now_iso()
                 return True
             return False
 
+    @staticmethod
+    def _encode_results(results: Dict[str, Any]) -> Dict[str, str]:
+        """Encode results entries as individual JSON hash fields."""
+        return {
+            RESULTS_FIELD_PREFIX + key: json.dumps(value, default=str)
+            for key, value in results.items()
+        }
+
+    @staticmethod
+    def _decode_transaction(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fold ``res_*`` hash fields back into the ``results`` dict.
+
+        Records written before results were split keep them as one JSON
+        ``results`` field; per-entry fields are newer and take precedence.
+        """
+        results = data.get("results")
+        results = dict(results) if isinstance(results, dict) else {}
+        transaction_data = {}
+        has_results = "results" in data
+        for field, value in data.items():
+            if not field.startswith(RESULTS_FIELD_PREFIX):
+                transaction_data[field] = value
+                continue
+            # RedisClient already decoded the JSON value
+            has_results = True
+            results[field.removeprefix(RESULTS_FIELD_PREFIX)] = value
+        if has_results:
+            transaction_data["results"] = results
+        return transaction_data
+
+    @staticmethod
+    def _retryable_index_membership(
+        status: str, results: Optional[Dict[str, Any]]
+    ) -> Optional[bool]:
+        """
+        Decide how an update affects the retryable index.
+
+        Errors are classified here, before they are serialized to Redis.
+
+        Returns:
+            True to add, False to remove, None to leave membership unchanged
+        """
+        if status != WorkflowStatus.FAILED.value:
+            return False
+        if results and "errors" in results:
+            return has_retryable_error(results["errors"])
+        return None
+
     def get_transaction(self, exchange_id: str) -> Optional[Dict[str, Any]]:
         """Get transaction by exchange_id (sync method for status endpoints)."""
         if self._redis_client:
+            cached = self._get_cached_transaction(exchange_id)
+            if cached is not None:
+                return cached
             try:
-                return self._redis_client.get_hash_sync(f"transaction:{exchange_id}")
+                data = self._redis_client.get_hash_sync(f"transaction:{exchange_id}")
+                if not data:
+                    return None
+                transaction_data = self._decode_transaction(data)
+                self._cache_transaction(exchange_id, transaction_data)
+                return transaction_data
             except Exception as e:
                 logger.error(f"Redis error getting transaction: {e}")
                 return None
         else:
-            return self._transactions.get(exchange_id)
+            record = self._transactions.get(exchange_id)
+            return record.to_dict() if record else None
+
+    def _get_cached_transaction(self, exchange_id: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached read (as a deep copy), or None."""
+        with self._read_cache_lock:
+            entry = self._read_cache.get(exchange_id)
+            if entry is None:
+                return None
+            expires_at, transaction_data = entry
+            if expires_at <= time.monotonic():
+                del self._read_cache[exchange_id]
+                return None
+            self._read_cache.move_to_end(exchange_id)
+            # Callers write into nested dicts such as request_data
+            return copy.deepcopy(transaction_data)
+
+    def _cache_transaction(
+        self, exchange_id: str, transaction_data: Dict[str, Any]
+    ) -> None:
+        """Cache a Redis read, evicting the least recently used entry when full."""
+        # Copied outside the lock; the caller keeps and may mutate the original
+        cached = copy.deepcopy(transaction_data)
+        with self._read_cache_lock:
+            self._read_cache[exchange_id] = (
+                time.monotonic() + TRANSACTION_CACHE_TTL,
+                cached,
+            )
+            self._read_cache.move_to_end(exchange_id)
+            if len(self._read_cache) > TRANSACTION_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+
+    def _invalidate_cached_transaction(self, exchange_id: str) -> None:
+        """Drop a cached read after this process writes the transaction."""
+        with self._read_cache_lock:
+            self._read_cache.pop(exchange_id, None)
 
     async def set_workflow_status(self, exchange_id: str, status: WorkflowStatus):
         """Update workflow status - persisted in Redis/storage."""
         await self.update_status(exchange_id, status.value)
 
+    def get_status(self, exchange_id: str) -> Optional[str]:
+        """
+        Get only the status of a transaction (sync, for polling).
+
+        Reads the single status field instead of decoding the whole record.
+
+        Returns:
+            Status value, or None if the transaction does not exist
+        """
+        if self._redis_client:
+            return self._redis_client.get_hash_field_sync(
+                f"transaction:{exchange_id}", "status"
+            )
+        record = self._transactions.get(exchange_id)
+        return record.status if record else None
+
     def is_workflow_running(self, exchange_id: str) -> bool:
         """Check if workflow is currently running based on persisted status."""
-        transaction_data = self.get_transaction(exchange_id)
-        if not transaction_data:
-            return False
-
-        current_status = transaction_data.get("status", "")
-        return current_status == WorkflowStatus.RUNNING.value
+        return self.get_status(exchange_id) == WorkflowStatus.RUNNING.value
 
     async def cleanup(self):
         """Cleanup resources."""
@@ -243,22 +484,73 @@ class TransactionService:
 
         if self._redis_client:
             try:
-                # Get all transaction keys
-                pattern = "transaction:*"
-                keys = await self._redis_client.keys(pattern)
-
-                # Check each transaction
-                for key in keys:
-                    transaction_data = await self._redis_client.get_hash(key)
-                    if transaction_data and transaction_data.get("status") == status:
-                        exchange_id = key.replace("transaction:", "")
-                        matching_transactions[exchange_id] = transaction_data
+                # SCAN + pipelined HGETALL batches: no KEYS stall, one round-trip
+                # per batch
+                async for batch in self.scan_transactions():
+                    for exchange_id, transaction_data in batch:
+                        if transaction_data.get("status") == status:
+                            matching_transactions[exchange_id] = transaction_data
             except Exception as e:
                 logger.error(f"Error getting transactions by status: {e}")
         else:
             # For in-memory storage
-            for exchange_id, transaction_data in self._transactions.items():
-                if transaction_data.get("status") == status:
-                    matching_transactions[exchange_id] = transaction_data
+            for exchange_id, record in self._transactions.items():
+                if record.status == status:
+                    matching_transactions[exchange_id] = record.to_dict()
 
         return matching_transactions
+
+    async def scan_transactions(
+        self, batch_size: int = 200
+    ) -> AsyncIterator[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Iterate stored Redis transactions in batches.
+
+        Uses SCAN plus pipelined HGETALL so large key spaces never block Redis
+        and each batch costs one round-trip.
+
+        Args:
+            batch_size: Number of transactions fetched per round-trip
+
+        Yields:
+            Lists of ``(exchange_id, transaction_data)`` tuples
+        """
+        async for batch in self._redis_client.scan_hashes(
+            "transaction:*", batch_size=batch_size
+        ):
+            yield [
+                (key.removeprefix("transaction:"), self._decode_transaction(data))
+                for key, data in batch
+            ]
+
+    async def get_retryable_ids(self) -> List[str]:
+        """Get exchange IDs indexed as failed with a retryable error (Redis only)."""
+        return await self._redis_client.get_set_members(RETRYABLE_INDEX_KEY)
+
+    async def remove_from_retryable_index(self, *exchange_ids: str) -> bool:
+        """Drop exchange IDs from the retryable index (Redis only)."""
+        if not exchange_ids:
+            return True
+        return await self._redis_client.remove_from_set(
+            RETRYABLE_INDEX_KEY, *exchange_ids
+        )
+
+    async def get_transactions(
+        self, exchange_ids: List[str]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Get several Redis transactions in one pipelined round-trip.
+
+        Args:
+            exchange_ids: Exchange IDs to fetch
+
+        Returns:
+            List of ``(exchange_id, transaction_data)`` for the ones that exist
+        """
+        hashes = await self._redis_client.get_hashes(
+            [f"transaction:{exchange_id}" for exchange_id in exchange_ids]
+        )
+        return [
+            (key.removeprefix("transaction:"), self._decode_transaction(data))
+            for key, data in hashes
+        ]
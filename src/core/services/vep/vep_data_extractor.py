@@ -7,15 +7,50 @@ This service extracts VEP data from:
 """
 
 import re
+import xml.etree.ElementTree as ET
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from loguru import logger
 from selenium.webdriver.common.by import By
 
 from core.models.vep_data import VEPData
 
+# Returns the visible text of the CCMA VEP cells in a single WebDriver round-trip
+_VEP_FIELDS_SCRIPT = """
+const text = (id) => {
+    const el = document.querySelector(`[id*='${id}']`);
+    return el ? el.innerText.trim() : null;
+};
+return {
+    nro_vep: text('td-nroVEP'),
+    descripcion: text('td-pagoDesc'),
+    importe: text('td-importe'),
+};
+"""
+
+# <VEP> attribute name -> VEPData field
+_VEP_ATTRIBUTE_FIELDS = {
+    "fechaExpiracion": "fecha_expiracion",
+    "nroFormulario": "nro_formulario",
+    "codTipoPago": "cod_tipo_pago",
+    "contribuyenteCUIT": "cuit",
+    "concepto": "concepto",
+    "subConcepto": "sub_concepto",
+    "periodoFiscal": "periodo_fiscal",
+    "importe": "importe",
+}
+
+_REQUIRED_VEP_FIELDS = (*_VEP_ATTRIBUTE_FIELDS.values(), "impuesto")
+
+# Page cell parsing
+_DIGITS_RE = re.compile(r"\d+")
+# Argentine amount: optional $, "." thousands separator, "," decimals ($ 255.404,12)
+_ARS_AMOUNT_RE = re.compile(r"[\$]?\s*([0-9]{1,3}(?:\.[0-9]{3})*(?:,[0-9]{2})?)")
+# Drops thousands separators and turns the decimal comma into a point
+_ARS_AMOUNT_TRANS = str.maketrans({".": None, ",": "."})
+
 
 class VEPDataExtractor:
     """
@@ -50,16 +85,13 @@ class VEPDataExtractor:
                 logger.error(f"VEP file not found: {vep_file_path}")
                 return []
 
-            # Read file content
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-
-            if not content:
+            if file_path.stat().st_size == 0:
                 logger.error(f"VEP file is empty: {vep_file_path}")
                 return []
 
-            # Parse VEP file content
-            vep_entries = self._parse_vep_file_content(content)
+            # Stream raw UTF-8 lines; expat decodes them, so no str decode pass
+            with open(file_path, "rb") as f:
+                vep_entries = self._parse_vep_file_content(f)
 
             logger.info(f"Extracted {len(vep_entries)} VEP entries from file")
             return vep_entries
@@ -98,42 +130,33 @@ class VEPDataExtractor:
             logger.error(f"Error extracting VEP data from web page: {e}")
             return None
 
-    def _parse_vep_file_content(self, content: str) -> List[VEPData]:
+    def _parse_vep_file_content(self, lines: Iterable[bytes]) -> List[VEPData]:
         """
-        Parse VEP file content and extract VEP entries.
+        Parse VEP file lines and extract VEP entries.
 
         Format: 02<VEP fechaExpiracion="..." ... ><Obligacion ... /></VEP>
 
         Args:
-            content: Raw VEP file content
+            lines: Raw VEP file lines (a file opened in binary mode)
 
         Returns:
             List of VEPData entries
         """
-        vep_entries = []
-        lines = content.split("\n")
-
-        for line in lines:
-            line = line.strip()
-
-            # Skip header lines (start with "01")
-            if line.startswith("01"):
-                continue
-
-            # Process VEP lines (start with "02")
-            if line.startswith("02"):
-                vep_data = self._parse_vep_line(line)
-                if vep_data:
-                    vep_entries.append(vep_data)
-
-        return vep_entries
-
-    def _parse_vep_line(self, line: str) -> Optional[VEPData]:
+        # Process VEP lines (start with "02"); header lines ("01") are skipped
+        stripped_lines = (line.strip() for line in lines)
+        parsed = (
+            self._parse_vep_line(line)
+            for line in stripped_lines
+            if line.startswith(b"02")
+        )
+        return [vep_data for vep_data in parsed if vep_data]
+
+    def _parse_vep_line(self, line: Union[str, bytes]) -> Optional[VEPData]:
         """
         Parse a single VEP line and extract data.
 
         Args:
-            line: VEP line content
+            line: VEP line content (UTF-8 bytes or text)
 
         Returns:
             VEPData instance or None if parsing failed
@@ -142,52 +165,27 @@ class VEPDataExtractor:
             # Remove "02" prefix
             xml_content = line[2:]
 
-            # Extract VEP attributes using regex
-            vep_data = {}
-
-            # Extract main VEP attributes
-            patterns = {
-                "fecha_expiracion": r'fechaExpiracion="([^"]*)"',
-                "nro_formulario": r'nroFormulario="([^"]*)"',
-                "cod_tipo_pago": r'codTipoPago="([^"]*)"',
-                "cuit": r'contribuyenteCUIT="([^"]*)"',
-                "concepto": r'concepto="([^"]*)"',
-                "sub_concepto": r'subConcepto="([^"]*)"',
-                "periodo_fiscal": r'periodoFiscal="([^"]*)"',
-                "importe": r'importe="([^"]*)"',
+            # Parse the XML with the C (expat) parser and read attributes
+            vep_element = ET.fromstring(xml_content)
+            attributes = vep_element.attrib
+            vep_data = {
+                field: attributes[name]
+                for name, field in _VEP_ATTRIBUTE_FIELDS.items()
+                if name in attributes
             }
-
-            for field, pattern in patterns.items():
-                match = re.search(pattern, xml_content)
-                if match:
-                    value = match.group(1)
-                    if field == "importe":
-                        vep_data[field] = float(value)
-                    else:
-                        vep_data[field] = value
+            if "importe" in vep_data:
+                vep_data["importe"] = float(vep_data["importe"])
 
             # Extract impuesto from Obligacion tag
-            impuesto_match = re.search(r'<Obligacion impuesto="([^"]*)"', xml_content)
-            if impuesto_match:
-                vep_data["impuesto"] = impuesto_match.group(1)
+            obligacion = vep_element.find("Obligacion")
+            if obligacion is not None and "impuesto" in obligacion.attrib:
+                vep_data["impuesto"] = obligacion.attrib["impuesto"]
 
             # Validate required fields
-            required_fields = [
-                "fecha_expiracion",
-                "nro_formulario",
-                "cod_tipo_pago",
-                "cuit",
-                "concepto",
-                "sub_concepto",
-                "periodo_fiscal",
-                "importe",
-                "impuesto",
-            ]
-
-            if all(field in vep_data for field in required_fields):
+            if all(field in vep_data for field in _REQUIRED_VEP_FIELDS):
                 return VEPData(**vep_data)
             else:
-                missing = [f for f in required_fields if f not in vep_data]
+                missing = [f for f in _REQUIRED_VEP_FIELDS if f not in vep_data]
                 logger.warning(f"Missing required fields in VEP line: {missing}")
                 return None
 
@@ -195,6 +193,15 @@ class VEPDataExtractor:
             logger.error(f"Error parsing VEP line: {e}")
             return None
 
+    @staticmethod
+    def _read_vep_fields(browser_manager) -> Dict[str, Optional[str]]:
+        """Read the VEP cells with a single WebDriver round-trip."""
+        try:
+            return browser_manager.driver.execute_script(_VEP_FIELDS_SCRIPT) or {}
+        except Exception as e:
+            logger.warning(f"Could not read VEP fields from page: {e}")
+            return {}
+
     def _extract_vep_from_dom(self, browser_manager) -> Optional[VEPData]:
         """
         Extract VEP data from DOM elements on the current page.
@@ -209,69 +216,46 @@ class VEPDataExtractor:
             # Extract VEP data using specific element IDs for CCMA
             vep_data = {}
 
-            # Extract VEP number from element with ID containing "td-nroVEP"
-            try:
+            # Read every cell in one call; only wait for the VEP table to render
+            # (and read again) when it is not on the page yet
+            page_fields = self._read_vep_fields(browser_manager)
+            if not page_fields.get("nro_vep"):
                 vep_element = browser_manager.find_element_safe(
                     By.XPATH, "//*[contains(@id, 'td-nroVEP')]", timeout=10
                 )
-                if vep_element and vep_element.text.strip():
-                    vep_text = vep_element.text.strip()
-                    # Extract numeric VEP number
-                    vep_match = re.search(r"\d+", vep_text)
-                    if vep_match:
-                        vep_data["nro_vep"] = vep_match.group()
-                        logger.info(f"Extracted VEP number: {vep_data['nro_vep']}")
-            except Exception as e:
-                logger.warning(
-                    f"Could not extract VEP number from element containing 'td-nroVEP': {e}"
-                )
+                if vep_element:
+                    page_fields = self._read_vep_fields(browser_manager)
+
+            # Extract numeric VEP number from element with ID containing "td-nroVEP"
+            vep_text = page_fields.get("nro_vep")
+            if vep_text:
+                vep_match = _DIGITS_RE.search(vep_text)
+                if vep_match:
+                    vep_data["nro_vep"] = vep_match.group()
+                    logger.info(f"Extracted VEP number: {vep_data['nro_vep']}")
 
             # Extract description from element with ID containing "td-pagoDesc"
-            try:
-                desc_element = browser_manager.find_element_safe(
-                    By.XPATH, "//*[contains(@id, 'td-pagoDesc')]", timeout=5
-                )
-                if desc_element and desc_element.text.strip():
-                    vep_data["descripcion"] = desc_element.text.strip()
-                    logger.info(f"Extracted description: {vep_data['descripcion']}")
-            except Exception as e:
-                logger.warning(
-                    f"Could not extract description from element containing 'td-pagoDesc': {e}"
-                )
+            if page_fields.get("descripcion"):
+                vep_data["descripcion"] = page_fields["descripcion"]
+                logger.info(f"Extracted description: {vep_data['descripcion']}")
 
             # Extract amount from element with ID containing "td-importe"
-            try:
-                amount_element = browser_manager.find_element_safe(
-                    By.XPATH, "//*[contains(@id, 'td-importe')]", timeout=5
-                )
-                if amount_element and amount_element.text.strip():
-                    amount_text = amount_element.text.strip()
-                    # Extract numeric amount (handle Argentine format: $ 255.404,12)
-                    # Pattern matches: optional $, spaces, digits with . as thousands separator and , as decimal separator
-                    amount_match = re.search(
-                        r"[\$]?\s*([0-9]{1,3}(?:\.[0-9]{3})*(?:,[0-9]{2})?)",
-                        amount_text,
-                    )
-                    if amount_match:
-                        amount_str = amount_match.group(1)
-                        # Convert Argentine format to standard float format
-                        # Replace thousands separator (.) with empty string
-                        amount_str = amount_str.replace(".", "")
-                        # Replace decimal separator (,) with dot
-                        amount_str = amount_str.replace(",", ".")
-                        try:
-                            vep_data["importe"] = float(amount_str)
-                            logger.info(
-                                f"Extracted amount: {vep_data['importe']} from text: {amount_text}"
-                            )
-                        except ValueError as e:
-                            logger.warning(
-                                f"Could not parse amount '{amount_str}' from text '{amount_text}': {e}"
-                            )
-            except Exception as e:
-                logger.warning(
-                    f"Could not extract amount from element containing 'td-importe': {e}"
-                )
+            amount_text = page_fields.get("importe")
+            if amount_text:
+                # Extract numeric amount (handle Argentine format: $ 255.404,12)
+                amount_match = _ARS_AMOUNT_RE.search(amount_text)
+                if amount_match:
+                    # Convert Argentine format to standard float format
+                    amount_str = amount_match.group(1).translate(_ARS_AMOUNT_TRANS)
+                    try:
+                        vep_data["importe"] = float(amount_str)
+                        logger.info(
+                            f"Extracted amount: {vep_data['importe']} from text: {amount_text}"
+                        )
+                    except ValueError as e:
+                        logger.warning(
+                            f"Could not parse amount '{amount_str}' from text '{amount_text}': {e}"
+                        )
 
             # Get period and calculation data from shared_resources
             debt_calculation = self.shared_resources.get("debt_calculation", {})
@@ -4,10 +4,22 @@ VEP Data Models - Data structures for VEP generation.
 This module defines data models for VEP data following type safety principles.
 """
 
+import re
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional
 
+_CUIT_RE = re.compile(r"\d{11}")
+# Separators allowed in formatted CUITs (e.g. "20-12345678-9")
+_CUIT_SEPARATORS = str.maketrans("", "", "- ")
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_cuit(cuit: str) -> bool:
+    """Check CUIT format; memoized since a file repeats the same few CUITs."""
+    return _CUIT_RE.fullmatch(cuit.translate(_CUIT_SEPARATORS)) is not None
+
 
 @dataclass
 class VEPData:
@@ -53,5 +65,4 @@ class VEPData:
             True if valid, False otherwise
         """
         # Basic CUIT validation (replace with actual validation logic)
-        cleaned_cuit = cuit.replace("-", "").replace(" ", "")
-        return len(cleaned_cuit) == 11 and cleaned_cuit.isdigit()
+        return _is_valid_cuit(cuit)
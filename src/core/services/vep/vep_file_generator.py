@@ -7,9 +7,9 @@ This service follows SOLID principles:
 - Dependency Inversion: Depends on file handler abstraction
 """
 
-from datetime import datetime
+from datetime import date
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 
@@ -18,6 +18,24 @@ from core.observability import record_file_operation, record_vep_operation
 from core.services.system.file_handler import FileHandler
 
 
+def _format_vep_row(entry: VEPData) -> str:
+    """Format one VEP entry as a ``02<VEP ...><Obligacion ... /></VEP>`` row."""
+    # Formatted once, used by both the VEP and the Obligacion attribute
+    importe = format(entry.importe, ".2f")
+    return (
+        f'02<VEP fechaExpiracion="{entry.fecha_expiracion}" '
+        f'nroFormulario="{entry.nro_formulario}" '
+        f'codTipoPago="{entry.cod_tipo_pago}" '
+        f'contribuyenteCUIT="{entry.cuit}" '
+        f'concepto="{entry.concepto}" '
+        f'subConcepto="{entry.sub_concepto}" '
+        f'periodoFiscal="{entry.periodo_fiscal}" '
+        f'importe="{importe}" '
+        f'><Obligacion impuesto="{entry.impuesto}" '
+        f'importe="{importe}" /></VEP>'
+    )
+
+
 class VEPFileGenerator:
     """
     VEP File Generator Service.
@@ -30,6 +48,8 @@ class VEPFileGenerator:
         """Initialize VEP file generator with file handler dependency."""
         self._file_handler = FileHandler()
         self._vep_directory = Path("resources/vep_files")
+        # (date ordinal, "YYYYMMDD") reused for every file generated that day
+        self._date_cache: Optional[Tuple[int, str]] = None
 
     def generate_vep_file(self, vep_entries: List[VEPData]) -> Optional[str]:
         """
@@ -59,7 +79,8 @@ class VEPFileGenerator:
             filename = self._generate_filename(vep_entries)
             filepath = self._vep_directory / filename
 
-            # Save VEP file
+            # Save VEP file (encoded once and written with a single unbuffered
+            # os.write; the 4-digit row count caps files at a few MB)
             if self._file_handler.save_text_file(vep_content, filepath):
                 # Record VEP generation success metric
                 record_vep_operation("generation", "success")
@@ -121,34 +142,17 @@ class VEPFileGenerator:
             Formatted VEP content as string, or None if formatting failed
         """
         try:
-            lines = []
+            if not vep_entries:
+                return ""
 
             # Generate header: 01{cuit}2000100100003003{size of vep rows, in 4 digits}
-            if vep_entries:
-                first_cuit = vep_entries[0].cuit
-                num_rows = len(vep_entries) + 1
-                header = f"01{first_cuit}2000100100003003{num_rows:04d}"
-                lines.append(header)
-
-            # Generate one row per VEP entry in the specified format
-            for entry in vep_entries:
-                # Format: 02<VEP fechaExpiracion="..." ... ><Obligacion ... /></VEP>
-                vep_line = (
-                    f'02<VEP fechaExpiracion="{entry.fecha_expiracion}" '
-                    f'nroFormulario="{entry.nro_formulario}" '
-                    f'codTipoPago="{entry.cod_tipo_pago}" '
-                    f'contribuyenteCUIT="{entry.cuit}" '
-                    f'concepto="{entry.concepto}" '
-                    f'subConcepto="{entry.sub_concepto}" '
-                    f'periodoFiscal="{entry.periodo_fiscal}" '
-                    f'importe="{entry.importe:.2f}" '
-                    f'><Obligacion impuesto="{entry.impuesto}" '
-                    f'importe="{entry.importe:.2f}" /></VEP>'
-                )
-
-                lines.append(vep_line)
-
-            return "\n".join(lines)
+            first_cuit = vep_entries[0].cuit
+            num_rows = len(vep_entries) + 1
+            header = f"01{first_cuit}2000100100003003{num_rows:04d}"
+
+            # One row per VEP entry, joined in a single pass
+            body = "\n".join(_format_vep_row(entry) for entry in vep_entries)
+            return f"{header}\n{body}"
 
         except Exception as e:
             logger.error(f"Error formatting VEP content: {e}")
@@ -167,8 +171,11 @@ class VEPFileGenerator:
         # Use first entry's CUIT for filename
         first_cuit = vep_entries[0].cuit if vep_entries else "00000000000"
 
-        # Generate date in YYYYMMDD format
-        date_str = datetime.now().strftime("%Y%m%d")
+        # Generate date in YYYYMMDD format, formatted once per day
+        today = date.today()
+        if self._date_cache is None or self._date_cache[0] != today.toordinal():
+            self._date_cache = (today.toordinal(), today.strftime("%Y%m%d"))
+        date_str = self._date_cache[1]
 
         return f"F20001.cuit.{first_cuit}.fecha.{date_str}.txt"
 
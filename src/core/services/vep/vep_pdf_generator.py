@@ -1,5 +1,7 @@
-import locale
 from datetime import datetime, timedelta
+from functools import lru_cache
+from math import fsum
+from operator import itemgetter
 
 from reportlab.graphics.shapes import Drawing, Line
 from reportlab.lib import colors
@@ -10,6 +12,27 @@ from reportlab.lib.units import cm
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
 
+@lru_cache(maxsize=256)
+def _format_ars(value: float) -> str:
+    """
+    Formatea un importe en ARS ($1.080,00) sin tocar el locale global del proceso.
+    """
+    entero, _, decimales = f"{value:,.2f}".partition(".")
+    return f"${entero.replace(',', '.')},{decimales}"
+
+
+# Estilo compartido de las tablas de campos (datos y fechas)
+_FIELD_TABLE_STYLE = TableStyle(
+    [
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 5),
+        ("TOPPADDING", (0, 0), (-1, -1), 2),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+    ]
+)
+
+
 class VepPdfGenerator:
     """
     Genera un Volante Electrónico de Pago (VEP) en PDF similar al
@@ -47,13 +70,21 @@ class VepPdfGenerator:
             days=dias_para_expirar
         )
         self.dias_expiracion_str = f"{dias_para_expirar} día/s"
-        self.importe_total = sum(item["importe"] for item in self.items_pago)
+        # fsum evita el error de redondeo acumulado al sumar floats
+        self.importe_total = fsum(map(itemgetter("importe"), self.items_pago))
 
         # Configuración de estilos
         self.styles = self._setup_styles()
 
-    def _setup_styles(self):
-        """Define los ParagraphStyle para el documento."""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _setup_styles():
+        """
+        Define los ParagraphStyle para el documento.
+
+        Se construyen una sola vez y se comparten entre PDFs: los estilos solo
+        se leen durante el build.
+        """
         styles = getSampleStyleSheet()
 
         # ARCA Header - Blue and bold
@@ -159,23 +190,24 @@ class VepPdfGenerator:
                 alignment=TA_RIGHT,
             )
         )
+
+        # Footer
+        styles.add(
+            ParagraphStyle(
+                name="Footer",
+                fontSize=8,
+                alignment=TA_CENTER,
+                textColor=colors.grey,
+                fontName="Helvetica-Oblique",
+            )
+        )
         return styles
 
     def _format_currency(self, value: float) -> str:
         """
         Formatea el valor flotante a la moneda en formato ARS ($ 1.080,00).
         """
-        try:
-            # Intenta usar la localización de Argentina
-            locale.setlocale(locale.LC_ALL, "es_AR.UTF-8")
-            formatted = locale.format_string("%.2f", value, grouping=True)
-        except locale.Error:
-            # Fallback manual si la localización falla
-            formatted = (
-                f"{value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-            )
-
-        return f"${formatted}"
+        return _format_ars(value)
 
     def _create_horizontal_line(self, width: float = 16 * cm) -> Drawing:
         """Creates a horizontal line for section separation."""
@@ -205,12 +237,15 @@ class VepPdfGenerator:
             bottomMargin=2 * cm,
         )
         story = []
+        styles = self.styles
+        field_title = styles["FieldTitle"]
+        field_body = styles["FieldBody"]
 
         # --- Header with ARCA and VEP side by side ---
         header_data = [
             [
-                Paragraph("ARCA", self.styles["ArcaHeader"]),
-                Paragraph("VEP", self.styles["VepHeader"]),
+                Paragraph("ARCA", styles["ArcaHeader"]),
+                Paragraph("VEP", styles["VepHeader"]),
             ]
         ]
         header_table = Table(header_data, colWidths=[8 * cm, 8 * cm])
@@ -229,101 +264,55 @@ class VepPdfGenerator:
         story.append(self._create_horizontal_line())
 
         # Subtitle
-        story.append(Paragraph("Volante Electrónico de Pago", self.styles["Subtitle"]))
+        story.append(Paragraph("Volante Electrónico de Pago", styles["Subtitle"]))
         story.append(Spacer(1, 0.3 * cm))
 
         # --- Warning with horizontal line ---
         warning_text = f"Atención: este VEP esta pendiente de pago y expira en {self.dias_expiracion_str}"
-        story.append(Paragraph(warning_text, self.styles["Warning"]))
+        story.append(Paragraph(warning_text, styles["Warning"]))
         story.append(self._create_horizontal_line())
         story.append(Spacer(1, 0.3 * cm))
 
         # --- Main Data Table ---
+        # Los Paragraph se crean por PDF: guardan estado de layout durante el
+        # build y no se pueden compartir entre PDFs generados en paralelo
+        fields = [
+            ("Nro. VEP:", self.nro_vep),
+            ("Organismo Recaudador:", self.organismo_recaudador),
+            ("Tipo de Pago:", self.tipo_pago),
+            ("Descripción Reducida:", self.descripcion_reducida),
+            ("CUIT:", self.cuit),
+            ("Concepto:", f"{self.concepto_codigo} {self.concepto_desc}"),
+            ("Subconcepto:", f"{self.subconcepto_codigo} {self.subconcepto_desc}"),
+            ("Período:", self.periodo),
+        ]
         data = [
-            [
-                Paragraph("Nro. VEP:", self.styles["FieldTitle"]),
-                Paragraph(self.nro_vep, self.styles["FieldBody"]),
-            ],
-            [
-                Paragraph("Organismo Recaudador:", self.styles["FieldTitle"]),
-                Paragraph(self.organismo_recaudador, self.styles["FieldBody"]),
-            ],
-            [
-                Paragraph("Tipo de Pago:", self.styles["FieldTitle"]),
-                Paragraph(self.tipo_pago, self.styles["FieldBody"]),
-            ],
-            [
-                Paragraph("Descripción Reducida:", self.styles["FieldTitle"]),
-                Paragraph(self.descripcion_reducida, self.styles["FieldBody"]),
-            ],
-            [
-                Paragraph("CUIT:", self.styles["FieldTitle"]),
-                Paragraph(self.cuit, self.styles["FieldBody"]),
-            ],
-            [
-                Paragraph("Concepto:", self.styles["FieldTitle"]),
-                Paragraph(
-                    f"{self.concepto_codigo} {self.concepto_desc}",
-                    self.styles["FieldBody"],
-                ),
-            ],
-            [
-                Paragraph("Subconcepto:", self.styles["FieldTitle"]),
-                Paragraph(
-                    f"{self.subconcepto_codigo} {self.subconcepto_desc}",
-                    self.styles["FieldBody"],
-                ),
-            ],
-            [
-                Paragraph("Período:", self.styles["FieldTitle"]),
-                Paragraph(self.periodo, self.styles["FieldBody"]),
-            ],
+            [Paragraph(label, field_title), Paragraph(value, field_body)]
+            for label, value in fields
         ]
 
         data_table = Table(data, colWidths=[4.5 * cm, 11.5 * cm])
-        data_table.setStyle(
-            TableStyle(
-                [
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 5),
-                    ("TOPPADDING", (0, 0), (-1, -1), 2),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
-                ]
-            )
-        )
+        data_table.setStyle(_FIELD_TABLE_STYLE)
         story.append(data_table)
         story.append(Spacer(1, 0.3 * cm))
 
         # --- Date Table ---
         date_data = [
             [
-                Paragraph("Fecha Generación:", self.styles["FieldTitle"]),
+                Paragraph("Fecha Generación:", field_title),
                 Paragraph(
                     self.fecha_generacion.strftime("%Y-%m-%d Hora: %H:%M:%S"),
-                    self.styles["FieldBody"],
+                    field_body,
                 ),
             ],
             [
-                Paragraph("Día de Expiración:", self.styles["FieldTitle"]),
-                Paragraph(
-                    self.fecha_expiracion.strftime("%Y-%m-%d"), self.styles["FieldBody"]
-                ),
+                Paragraph("Día de Expiración:", field_title),
+                Paragraph(self.fecha_expiracion.strftime("%Y-%m-%d"), field_body),
             ],
         ]
 
         date_table = Table(date_data, colWidths=[4.5 * cm, 11.5 * cm])
-        date_table.setStyle(
-            TableStyle(
-                [
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 5),
-                    ("TOPPADDING", (0, 0), (-1, -1), 2),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
-                ]
-            )
-        )
+        date_table.setStyle(_FIELD_TABLE_STYLE)
         story.append(date_table)
         story.append(Spacer(1, 0.5 * cm))
 
@@ -333,10 +322,10 @@ class VepPdfGenerator:
         # Total row
         amount_data.append(
             [
-                Paragraph("Importe total a pagar", self.styles["AmountTotal"]),
+                Paragraph("Importe total a pagar", styles["AmountTotal"]),
                 Paragraph(
                     self._format_currency(self.importe_total),
-                    self.styles["AmountTotalValue"],
+                    styles["AmountTotalValue"],
                 ),
             ]
         )
@@ -360,14 +349,7 @@ class VepPdfGenerator:
         # Footer
         story.append(Spacer(1, 1 * cm))
         footer_text = "VEP Generated by 'ArcaAutoVep'"
-        footer_style = ParagraphStyle(
-            name="Footer",
-            fontSize=8,
-            alignment=TA_CENTER,
-            textColor=colors.grey,
-            fontName="Helvetica-Oblique",
-        )
-        story.append(Paragraph(footer_text, footer_style))
+        story.append(Paragraph(footer_text, styles["Footer"]))
 
         # Construir el PDF
         doc.build(story)
@@ -2,6 +2,7 @@
 Core utilities module.
 """
 
+from core.utils.file_utils import ensure_dir, write_bytes
 from core.utils.vep_results import extract_file_paths, process_vep_results
 
-__all__ = ["process_vep_results", "extract_file_paths"]
+__all__ = ["process_vep_results", "extract_file_paths", "ensure_dir", "write_bytes"]
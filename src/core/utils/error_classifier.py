@@ -3,10 +3,8 @@ Utility for classifying errors as retryable or not using specific exception type
 """
 
 import sys
-
-# Import built-in exception types
-from socket import ConnectionAbortedError, ConnectionRefusedError, ConnectionResetError
-from typing import Any, Dict
+from collections import deque
+from typing import Any, Dict, Tuple
 
 # Import Selenium and infrastructure exceptions for type checking
 try:
@@ -46,6 +44,32 @@ except ImportError:
     HAS_HTTP_CLIENT = False
 
 
+try:
+    from core.exceptions import BrowserSessionException, InfrastructureException
+
+    _APP_RETRYABLE_TYPES: Tuple[type, ...] = (
+        InfrastructureException,
+        BrowserSessionException,
+    )
+except ImportError:
+    _APP_RETRYABLE_TYPES = ()
+
+# Exception types that mark an error as retryable, built once at import time
+_RETRYABLE_TYPES: Tuple[type, ...] = _APP_RETRYABLE_TYPES + (
+    TimeoutError,
+    ConnectionRefusedError,
+    ConnectionAbortedError,
+    ConnectionResetError,
+    ServiceUnavailable,
+    SessionNotCreatedException,
+    WebDriverException,
+    NoSuchDriverException,
+    BrowserNotConnectedException,
+)
+# Exact-type fast path, subclasses fall back to isinstance
+_RETRYABLE_EXACT = frozenset(_RETRYABLE_TYPES)
+
+
 def is_retryable_error(error_input: Exception) -> bool:
     """
     Check if an exception indicates a retryable error based on its type.
@@ -58,47 +82,9 @@ def is_retryable_error(error_input: Exception) -> bool:
     """
     # Only accept Exception objects, not error message strings
     # The anti-pattern of parsing error messages is completely eliminated
-    # Check using specific exception types
-    try:
-        from core.exceptions import BrowserSessionException, InfrastructureException
-
-        # Check if it's a known retryable exception type
-        if isinstance(error_input, (InfrastructureException, BrowserSessionException)):
-            return True
-
-    except ImportError:
-        pass  # Continue to check built-in exception types
-
-    # Check for common Selenium and infrastructure exceptions using exact type matching
-    # This eliminates the anti-pattern of substring matching in exception type names
-    retryable_types = (
-        TimeoutError,
-        ConnectionRefusedError,
-        ConnectionAbortedError,
-        ConnectionResetError,
-        ServiceUnavailable,
-        SessionNotCreatedException,
-        WebDriverException,
-        NoSuchDriverException,
-        BrowserNotConnectedException,
-    )
-
-    if isinstance(error_input, retryable_types):
+    if type(error_input) in _RETRYABLE_EXACT:
         return True
-
-    # Check built-in exception types for connectivity issues
-    if isinstance(
-        error_input,
-        (
-            ConnectionRefusedError,
-            ConnectionAbortedError,
-            ConnectionResetError,
-            TimeoutError,
-        ),
-    ):
-        return True
-
-    return False
+    return isinstance(error_input, _RETRYABLE_TYPES)
 
 
 def has_retryable_error(errors: Dict[str, Any]) -> bool:
@@ -114,19 +100,16 @@ def has_retryable_error(errors: Dict[str, Any]) -> bool:
     if not errors:
         return False
 
-    for error_detail in errors.values():
-        if isinstance(error_detail, Exception) and is_retryable_error(error_detail):
-            return True
-        elif isinstance(error_detail, dict):
-            # Recursively check nested error details
-            if has_retryable_error(error_detail):
+    # Walk nested dicts and lists with a work stack instead of recursing
+    stack = deque(errors.values())
+    while stack:
+        error_detail = stack.pop()
+        if isinstance(error_detail, Exception):
+            if is_retryable_error(error_detail):
                 return True
+        elif isinstance(error_detail, dict):
+            stack.extend(error_detail.values())
         elif isinstance(error_detail, list):
-            # Check if it's a list of errors
-            for item in error_detail:
-                if isinstance(item, Exception) and is_retryable_error(item):
-                    return True
-                elif isinstance(item, dict) and has_retryable_error(item):
-                    return True
+            stack.extend(error_detail)
 
     return False
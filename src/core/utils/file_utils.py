@@ -0,0 +1,48 @@
+"""
+Filesystem helpers shared by services that write generated files.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Set
+
+# Directories already created by this process
+_DIRS_READY: Set[Path] = set()
+_DIRS_LOCK = threading.Lock()
+
+
+def ensure_dir(path: Path) -> None:
+    """
+    Create a directory (and parents) once per process.
+
+    Later calls for the same path return without touching the filesystem.
+
+    Args:
+        path: Directory to create
+    """
+    if path in _DIRS_READY:
+        return
+    with _DIRS_LOCK:
+        if path not in _DIRS_READY:
+            path.mkdir(parents=True, exist_ok=True)
+            _DIRS_READY.add(path)
+
+
+def write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write a payload with raw os.write calls, bypassing buffered I/O.
+
+    Args:
+        path: File to create or truncate
+        data: Bytes to write
+    """
+    fd = os.open(
+        os.fspath(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644
+    )
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
@@ -4,12 +4,29 @@ VEP result processing utilities for workflow outputs.
 
 import base64
 import mimetypes
+import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 from uuid import UUID
 
 from loguru import logger
 
+# Keys handled explicitly (or not meant for the API response)
+_EXCLUDED_RESULT_KEYS = frozenset(
+    {"payment_url", "vep_pdf_filename", "vep_qr_filename"}
+)
+
+# MIME types of the files workflows produce; anything else goes through mimetypes
+_EXT_MIME = {".pdf": "application/pdf", ".png": "image/png", ".txt": "text/plain"}
+
+# Multiple of 3 so per-chunk base64 output concatenates without padding
+_BASE64_CHUNK_SIZE = 57 * 1024
+
+
+def _is_qr_path_key(key: str) -> bool:
+    """Check if a result key holds a QR image path."""
+    return "path" in key and "qr" in key.lower()
+
 
 def _is_serializable(value: Any) -> bool:
     """Check if a value can be serialized to JSON."""
@@ -33,21 +50,36 @@ def _is_serializable(value: Any) -> bool:
         return False
 
 
+def _read_base64(path: Path) -> str:
+    """Base64-encode a file chunk by chunk into a preallocated buffer."""
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        encoded = bytearray(4 * ((size + 2) // 3))
+        position = 0
+        while chunk := file.read(_BASE64_CHUNK_SIZE):
+            block = base64.b64encode(chunk)
+            encoded[position : position + len(block)] = block
+            position += len(block)
+    # The file may have changed size since fstat(), trim to what was written
+    del encoded[position:]
+    return encoded.decode("ascii")
+
+
 def _create_file_data_dict(file_path: str) -> Optional[Dict[str, str]]:
     """Create file data dictionary with base64 content."""
     try:
         path = Path(file_path)
-        if not path.exists():
+        try:
+            base64_content = _read_base64(path)
+        except FileNotFoundError:
             logger.warning(f"File not found: {file_path}")
             return None
 
-        # Read file content
-        file_content = path.read_bytes()
-        base64_content = base64.b64encode(file_content).decode("utf-8")
-
-        # Get MIME type
-        content_type, _ = mimetypes.guess_type(file_path)
-        mime_type = content_type or "application/octet-stream"
+        # Get MIME type, known output types first
+        mime_type = _EXT_MIME.get(path.suffix.lower())
+        if mime_type is None:
+            content_type, _ = mimetypes.guess_type(file_path)
+            mime_type = content_type or "application/octet-stream"
 
         return {
             "filename": path.name,
@@ -96,39 +128,32 @@ def process_vep_results(
                         f"Added PDF to processed results: {pdf_data['filename']}"
                     )
 
-        # Process QR/PNG files (find first QR path)
-        qr_files = [
-            key
-            for key in workflow_results.keys()
-            if "qr" in key.lower() and "path" in key
-        ]
-        for qr_key in qr_files:
-            qr_path = workflow_results[qr_key]
-            if qr_path and Path(qr_path).exists():
-                png_data = _create_file_data_dict(qr_path)
+        # Single pass: pick the first usable QR/PNG file and collect the other
+        # serializable non-file results
+        png_data = None
+        other_results = {}
+        for k, v in workflow_results.items():
+            if (
+                not k.endswith("_path")  # Exclude file paths
+                and k not in _EXCLUDED_RESULT_KEYS  # Exclude already processed keys
+                and not k.endswith("_service")  # Exclude service objects
+                and _is_serializable(v)  # Only include serializable types
+            ):
+                other_results[k] = v
+
+            if png_data is None and v and _is_qr_path_key(k):
+                png_data = _create_file_data_dict(v)
                 if png_data:
                     processed_results["png"] = png_data
                     logger.debug(
                         f"Added PNG to processed results: {png_data['filename']}"
                     )
-                    break  # Only process first QR file found
 
         # Include payment URL if available
         if "payment_url" in workflow_results:
             processed_results["payment_url"] = workflow_results["payment_url"]
 
-        # Include other serializable non-file results
-        excluded_keys = {"payment_url", "vep_pdf_filename", "vep_qr_filename"}
-
-        for k, v in workflow_results.items():
-            if (
-                not k.endswith("_path")  # Exclude file paths
-                and k not in excluded_keys  # Exclude already processed keys
-                and not k.endswith("_service")  # Exclude service objects
-                and _is_serializable(v)  # Only include serializable types
-            ):
-                processed_results[k] = v
-
+        processed_results.update(other_results)
         return processed_results
 
     except Exception as e:
@@ -148,13 +173,11 @@ def extract_file_paths(workflow_results: Dict[str, Any]) -> Dict[str, str]:
     if "vep_pdf_path" in workflow_results and workflow_results["vep_pdf_path"]:
         file_paths["pdf"] = workflow_results["vep_pdf_path"]
 
-    # Extract QR/PNG paths
-    qr_files = [
-        key for key in workflow_results.keys() if "qr" in key.lower() and "path" in key
-    ]
-    for qr_key in qr_files:
-        if workflow_results[qr_key]:
-            file_paths["png"] = workflow_results[qr_key]
-            break
+    # Extract the first QR/PNG path
+    qr_path = next(
+        (v for k, v in workflow_results.items() if v and _is_qr_path_key(k)), None
+    )
+    if qr_path:
+        file_paths["png"] = qr_path
 
     return file_paths
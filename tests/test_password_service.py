@@ -2,9 +2,14 @@
 Test suite for password service.
 """
 
+import hashlib
+import json
 import os
 import sys
 
+from cryptography.fernet import Fernet
+from openpyxl import Workbook
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -14,9 +19,97 @@ from core.exceptions.password_exceptions import (
     PasswordNotFoundError,
     PasswordServiceNotAvailableError,
 )
+from core.services.system import password_service
 from core.services.system.password_service import PasswordService
 
 
+def _write_encrypted_workbook(path, rows, fernet_key):
+    """Write rows (header first) as an .xlsx encrypted with fernet_key."""
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(list(row))
+    workbook.save(path)
+    path.write_bytes(Fernet(fernet_key).encrypt(path.read_bytes()))
+
+
+def _load_password_map(tmp_path, monkeypatch, rows):
+    """Load rows through PasswordService with the on-disk cache kept in tmp_path."""
+    monkeypatch.setattr(password_service, "_CACHE_DIR", tmp_path / "cache")
+    fernet_key = Fernet.generate_key().decode()
+    excel_path = tmp_path / "claves.xlsx"
+    _write_encrypted_workbook(excel_path, rows, fernet_key)
+    return PasswordService(fernet_key, str(excel_path))._load_passwords()
+
+
+def test_password_map_matches_pandas_output(tmp_path, monkeypatch):
+    """Blank, NA-marker and padded cells are dropped as pandas.read_excel did."""
+    rows = [
+        ("cuit", "clave"),
+        ("20111111112", "pass1"),
+        (" 20222222223 ", " pass2 "),
+        (20333333334, "pass3"),
+        ("20444444445", None),
+        ("20555555556", "nan"),
+        ("20666666667", " nan "),
+        ("20777777778", "NULL"),
+        ("20888888889", "   "),
+        ("20999999990", "N/A"),
+        ("20101010101", "None"),
+        ("20111111112", "pass1-dup"),
+        ("20121212121", "NaN"),
+        ("20141414141", "pass14"),
+    ]
+
+    # Output of the previous pandas implementation for the same sheet
+    expected = {
+        "20111111112": "pass1-dup",
+        "20222222223": "pass2",
+        "20333333334": "pass3",
+        "20141414141": "pass14",
+    }
+    assert _load_password_map(tmp_path, monkeypatch, rows) == expected
+
+
+def test_password_map_skips_blank_cuit_cells(tmp_path, monkeypatch):
+    """
+    Rows with a blank or NA CUIT are skipped and the other CUITs keep their text.
+
+    pandas turned such a column into floats ("20111111112.0"), so these
+    lookups used to miss; that is intentionally not reproduced.
+    """
+    rows = [
+        ("cuit", "clave"),
+        ("20111111112", "pass1"),
+        (None, "orphan"),
+        ("NaN", "pass2"),
+        ("20131313131",),
+    ]
+
+    expected = {"20111111112": "pass1"}
+    assert _load_password_map(tmp_path, monkeypatch, rows) == expected
+
+
+def test_password_map_ignores_older_cache_format(tmp_path, monkeypatch):
+    """Maps cached under an older format are not reused and get pruned."""
+    monkeypatch.setattr(password_service, "_CACHE_DIR", tmp_path / "cache")
+    fernet_key = Fernet.generate_key().decode()
+    excel_path = tmp_path / "claves.xlsx"
+    _write_encrypted_workbook(
+        excel_path, [("cuit", "clave"), ("20111111112", "pass1")], fernet_key
+    )
+
+    # Pre-versioning cache entry for the same workbook, still holding an NA marker
+    digest = hashlib.sha256(excel_path.read_bytes()).hexdigest()
+    stale_path = tmp_path / "cache" / f"passwords-{digest}.bin"
+    stale_path.parent.mkdir()
+    stale_map = {"20111111112": "pass1", "20555555556": "nan"}
+    stale_path.write_bytes(Fernet(fernet_key).encrypt(json.dumps(stale_map).encode()))
+
+    service = PasswordService(fernet_key, str(excel_path))
+    assert service._load_passwords() == {"20111111112": "pass1"}
+    assert not stale_path.exists()
+
+
 def test_password_service_with_real_file():
     """Test password service with actual encrypted Excel file."""
     # Get FERNET_KEY from environment
@@ -0,0 +1,235 @@
+"""
+Test suite for transaction storage and the retryable index.
+
+Redis tests need a disposable server in TEST_REDIS_URL
+(e.g. redis://localhost:6379/15) and are skipped without it.
+"""
+
+import json
+import os
+import sys
+import uuid
+
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.services.retry_service import RetryService
+from core.services.transaction_service import (
+    RETRYABLE_INDEX_KEY,
+    TransactionService,
+)
+from core.workflows.base import WorkflowStatus
+
+REDIS_URL = os.getenv("TEST_REDIS_URL")
+
+requires_redis = pytest.mark.skipif(
+    not REDIS_URL, reason="TEST_REDIS_URL environment variable not set"
+)
+
+FAILED = WorkflowStatus.FAILED.value
+PENDING = WorkflowStatus.PENDING.value
+
+
+@pytest.fixture
+async def redis_service():
+    """TransactionService on Redis; removes the transactions it created."""
+    service = TransactionService(redis_url=REDIS_URL, use_redis=True)
+    created = []
+
+    async def create(ttl_seconds=3600):
+        exchange_id = str(uuid.uuid4())
+        created.append(exchange_id)
+        assert await service.create_transaction(
+            exchange_id, uuid.uuid4().hex, {"data": {"entries": []}}, ttl_seconds
+        )
+        return exchange_id
+
+    service.create_test_transaction = create
+    yield service
+
+    client = await service._redis_client.get_async_client()
+    if created:
+        await client.delete(*(f"transaction:{i}" for i in created))
+        await client.srem(RETRYABLE_INDEX_KEY, *created)
+    await service.cleanup()
+    service._redis_client.get_sync_client().close()
+
+
+def test_decode_transaction_folds_result_fields():
+    """res_* fields become results entries and win over a legacy results field."""
+    stored = {
+        "status": FAILED,
+        "results": {"retry_count": 1, "payment_url": "old"},
+        "res_payment_url": "new",
+        "res_errors": {"step": "timeout"},
+    }
+
+    assert TransactionService._decode_transaction(stored) == {
+        "status": FAILED,
+        "results": {
+            "retry_count": 1,
+            "payment_url": "new",
+            "errors": {"step": "timeout"},
+        },
+    }
+
+
+async def test_update_status_preserves_retry_count_in_memory():
+    """Later results are merged into, not replacing, the stored results."""
+    service = TransactionService()
+    await service.create_transaction("ex-1", "hash-1", {}, 3600)
+
+    await service.update_status("ex-1", PENDING, {"retry_count": 2})
+    await service.update_status("ex-1", FAILED, {"errors": {"step": "timeout"}})
+
+    results = service.get_transaction("ex-1")["results"]
+    assert results == {"retry_count": 2, "errors": {"step": "timeout"}}
+
+
+def test_retry_count_is_read_from_results():
+    """Exhausted transactions are not retryable once retry_count hits the limit."""
+    retry_service = RetryService(TransactionService(), workflow_orchestrator=None)
+    transaction = {
+        "status": FAILED,
+        "results": {"retry_count": 2, "errors": {"step": TimeoutError("timeout")}},
+    }
+
+    assert retry_service._is_transaction_retryable(transaction, max_retries=3)
+    transaction["results"]["retry_count"] = 3
+    assert not retry_service._is_transaction_retryable(transaction, max_retries=3)
+
+
+@requires_redis
+async def test_create_transaction_script(redis_service):
+    """The create script stores the hash and duplicate mapping, both with TTL."""
+    exchange_id = await redis_service.create_test_transaction(ttl_seconds=120)
+    client = redis_service._redis_client.get_sync_client()
+
+    transaction = redis_service.get_transaction(exchange_id)
+    assert transaction["status"] == WorkflowStatus.CREATED.value
+    assert transaction["request_data"] == {"data": {"entries": []}}
+    assert transaction["ttl_seconds"] == 120
+    assert 0 < client.ttl(f"transaction:{exchange_id}") <= 120
+    assert 0 < client.ttl("transaction_hashes") <= 120
+
+    transaction_hash = transaction["transaction_hash"]
+    assert await redis_service.check_duplicate(transaction_hash) == exchange_id
+
+
+@requires_redis
+async def test_cached_reads_are_independent_copies(redis_service):
+    """Writes into a returned transaction never reach the read cache."""
+    exchange_id = await redis_service.create_test_transaction()
+
+    first = redis_service.get_transaction(exchange_id)
+    first["request_data"]["_workflow_error"] = "boom"
+    second = redis_service.get_transaction(exchange_id)
+    second["request_data"]["_workflow_result"] = {"ok": True}
+
+    assert redis_service.get_transaction(exchange_id)["request_data"] == {
+        "data": {"entries": []}
+    }
+
+
+@requires_redis
+async def test_results_round_trip(redis_service):
+    """Results are stored as res_* hash fields and read back as one dict."""
+    exchange_id = await redis_service.create_test_transaction()
+    results = {
+        "vep_pdf_path": "resources/pdf/vep.pdf",
+        "vep": {"nro_vep": "123", "importe": 150.5},
+        "retry_count": 1,
+    }
+
+    assert await redis_service.update_status(exchange_id, FAILED, results)
+
+    client = redis_service._redis_client.get_sync_client()
+    raw = client.hgetall(f"transaction:{exchange_id}")
+    assert "results" not in raw
+    assert json.loads(raw["res_vep"]) == results["vep"]
+
+    transaction = redis_service.get_transaction(exchange_id)
+    assert transaction["status"] == FAILED
+    assert transaction["results"] == results
+
+
+@requires_redis
+async def test_legacy_results_field_is_read(redis_service):
+    """Records written before the split keep their JSON results field readable."""
+    exchange_id = await redis_service.create_test_transaction()
+    client = redis_service._redis_client.get_sync_client()
+    client.hset(
+        f"transaction:{exchange_id}",
+        "results",
+        json.dumps({"retry_count": 1, "payment_url": "https://pay.example"}),
+    )
+
+    await redis_service.update_status(exchange_id, FAILED, {"errors": {"s": "x"}})
+
+    results = redis_service.get_transaction(exchange_id)["results"]
+    assert results == {
+        "retry_count": 1,
+        "payment_url": "https://pay.example",
+        "errors": {"s": "x"},
+    }
+
+
+@requires_redis
+async def test_update_status_preserves_retry_count(redis_service):
+    """A status update with other results keeps the stored retry count."""
+    exchange_id = await redis_service.create_test_transaction()
+
+    await redis_service.update_status(exchange_id, PENDING, {"retry_count": 2})
+    await redis_service.update_status(exchange_id, FAILED, {"errors": {"s": "x"}})
+
+    results = redis_service.get_transaction(exchange_id)["results"]
+    assert results["retry_count"] == 2
+    assert results["errors"] == {"s": "x"}
+
+
+@requires_redis
+async def test_retryable_index_add_and_remove(redis_service):
+    """Only failures with a retryable error are indexed; other statuses leave it."""
+    retryable_id = await redis_service.create_test_transaction()
+    permanent_id = await redis_service.create_test_transaction()
+
+    await redis_service.update_status(
+        retryable_id, FAILED, {"errors": {"step": TimeoutError("timeout")}}
+    )
+    await redis_service.update_status(
+        permanent_id, FAILED, {"errors": {"step": ValueError("bad input")}}
+    )
+
+    indexed = set(await redis_service.get_retryable_ids())
+    assert retryable_id in indexed
+    assert permanent_id not in indexed
+
+    await redis_service.update_status(retryable_id, PENDING, {"retry_count": 1})
+    assert retryable_id not in set(await redis_service.get_retryable_ids())
+
+
+@requires_redis
+async def test_retry_sweep_prunes_exhausted_transactions(redis_service):
+    """The indexed sweep drops transactions that used up their retries."""
+    retry_service = RetryService(redis_service, workflow_orchestrator=None)
+    fresh_id = await redis_service.create_test_transaction()
+    exhausted_id = await redis_service.create_test_transaction()
+
+    errors = {"errors": {"step": TimeoutError("timeout")}}
+    await redis_service.update_status(fresh_id, FAILED, {"retry_count": 1, **errors})
+    await redis_service.update_status(
+        exhausted_id, FAILED, {"retry_count": 3, **errors}
+    )
+
+    found = {
+        t["exchange_id"]
+        for t in await retry_service.get_retryable_transactions(max_retries=3)
+    }
+    assert fresh_id in found
+    assert exhausted_id not in found
+
+    indexed = set(await redis_service.get_retryable_ids())
+    assert fresh_id in indexed
+    assert exhausted_id not in indexed